@@ -0,0 +1,80 @@
+"""add trigger-maintained users row counter
+
+Revision ID: 8c41e7d2b5f3
+Revises: 3b9d2f4c7a10
+Create Date: 2026-10-18 10:02:47.190342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41e7d2b5f3'
+down_revision: Union[str, None] = '3b9d2f4c7a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('table_row_counts',
+    sa.Column('table_name', sa.String(length=63), nullable=False),
+    sa.Column('row_count', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    op.execute("INSERT INTO table_row_counts (table_name, row_count) SELECT 'users', count(*) FROM users")
+
+    # Statement-level triggers with transition tables: one counter update per
+    # statement, so multi-row inserts and deletes stay cheap.
+    op.execute("""
+        CREATE FUNCTION users_row_count_insert() RETURNS trigger AS $$
+        BEGIN
+            UPDATE table_row_counts SET row_count = row_count + (SELECT count(*) FROM new_rows)
+            WHERE table_name = 'users';
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE FUNCTION users_row_count_delete() RETURNS trigger AS $$
+        BEGIN
+            UPDATE table_row_counts SET row_count = row_count - (SELECT count(*) FROM old_rows)
+            WHERE table_name = 'users';
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE FUNCTION users_row_count_truncate() RETURNS trigger AS $$
+        BEGIN
+            UPDATE table_row_counts SET row_count = 0 WHERE table_name = 'users';
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER users_row_count_insert AFTER INSERT ON users
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION users_row_count_insert()
+    """)
+    op.execute("""
+        CREATE TRIGGER users_row_count_delete AFTER DELETE ON users
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION users_row_count_delete()
+    """)
+    op.execute("""
+        CREATE TRIGGER users_row_count_truncate AFTER TRUNCATE ON users
+        FOR EACH STATEMENT EXECUTE FUNCTION users_row_count_truncate()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS users_row_count_truncate ON users")
+    op.execute("DROP TRIGGER IF EXISTS users_row_count_delete ON users")
+    op.execute("DROP TRIGGER IF EXISTS users_row_count_insert ON users")
+    op.execute("DROP FUNCTION IF EXISTS users_row_count_truncate()")
+    op.execute("DROP FUNCTION IF EXISTS users_row_count_delete()")
+    op.execute("DROP FUNCTION IF EXISTS users_row_count_insert()")
+    op.drop_table('table_row_counts')
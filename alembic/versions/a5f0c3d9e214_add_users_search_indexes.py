@@ -0,0 +1,38 @@
+"""add users search indexes
+
+Revision ID: a5f0c3d9e214
+Revises: 8c41e7d2b5f3
+Create Date: 2026-10-18 11:26:35.804117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5f0c3d9e214'
+down_revision: Union[str, None] = '8c41e7d2b5f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_DOCUMENT = (
+    "to_tsvector('simple'::regconfig, coalesce(nickname, '') || ' ' || coalesce(email, '') || ' ' || "
+    "coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || coalesce(bio, ''))"
+)
+TRIGRAM_COLUMNS = ('nickname', 'email', 'first_name', 'last_name')
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_users_search_document', 'users', [sa.text(SEARCH_DOCUMENT)], unique=False, postgresql_using='gin')
+    for column in TRIGRAM_COLUMNS:
+        op.create_index(f'ix_users_{column}_trgm', 'users', [column], unique=False,
+                        postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    for column in TRIGRAM_COLUMNS:
+        op.drop_index(f'ix_users_{column}_trgm', table_name='users')
+    op.drop_index('ix_users_search_document', table_name='users')
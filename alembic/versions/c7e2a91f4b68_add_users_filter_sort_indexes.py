@@ -0,0 +1,40 @@
+"""add users filter and sort indexes
+
+Revision ID: c7e2a91f4b68
+Revises: a5f0c3d9e214
+Create Date: 2026-10-18 12:41:09.367815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2a91f4b68'
+down_revision: Union[str, None] = 'a5f0c3d9e214'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_last_login_at_id', 'users', ['last_login_at', 'id'], unique=False)
+    op.create_index('ix_users_role_created_at_id', 'users', ['role', 'created_at', 'id'], unique=False)
+    op.create_index('ix_users_role_last_login_at_id', 'users', ['role', 'last_login_at', 'id'], unique=False)
+    # Partial indexes for the selective flag filters; predicates must match UserService._user_filters
+    op.create_index('ix_users_locked_created_at_id', 'users', ['created_at', 'id'], unique=False,
+                    postgresql_where=sa.text('is_locked'))
+    op.create_index('ix_users_unverified_created_at_id', 'users', ['created_at', 'id'], unique=False,
+                    postgresql_where=sa.text('NOT email_verified'))
+    op.create_index('ix_users_professional_created_at_id', 'users', ['created_at', 'id'], unique=False,
+                    postgresql_where=sa.text('is_professional'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_professional_created_at_id', table_name='users')
+    op.drop_index('ix_users_unverified_created_at_id', table_name='users')
+    op.drop_index('ix_users_locked_created_at_id', table_name='users')
+    op.drop_index('ix_users_role_last_login_at_id', table_name='users')
+    op.drop_index('ix_users_role_created_at_id', table_name='users')
+    op.drop_index('ix_users_last_login_at_id', table_name='users')
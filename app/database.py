@@ -1,36 +1,184 @@
 # app/database.py
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+import re
+import time
+import weakref
+from typing import Any, Dict, Optional
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-import os
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.elements import TextClause
 
-# Keep the existing setup
-DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+asyncpg://postgres:postgres@db:5432/appdb")
-engine = create_async_engine(DATABASE_URL, echo=True)
-AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
-# Add the Database class that main.py expects
+class PoolStats:
+    """Counters for time spent waiting to check a connection out of the pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+
+    def record(self, waited: float, timed_out: bool = False):
+        self.checkouts += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        if timed_out:
+            self.timeouts += 1
+
+pool_stats = PoolStats()
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            pool_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_stats.record(time.perf_counter() - started)
+        return connection
+
+# bind_arguments for a read that may be served by the read replica
+REPLICA_READ = {"replica": True}
+# bind_arguments for a streamed (server-side cursor) read that may be served by the read replica
+REPLICA_STREAM = {"replica": True, "stream": True}
+
+# text() statements that only read: a SELECT without a locking clause
+_READ_TEXT = re.compile(r"\s*SELECT\b(?!.*\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE|KEY\s+SHARE)\b)", re.IGNORECASE | re.DOTALL)
+
+def is_read(clause) -> bool:
+    """Whether a statement only reads. DML, locking SELECTs, other text() and a missing clause count as writes."""
+    if clause is None:
+        return False
+    if isinstance(clause, TextClause):
+        return _READ_TEXT.match(clause.text) is not None
+    return clause.is_select and getattr(clause, "_for_update_arg", None) is None
+
+_stream_engines: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+def stream_engine(engine):
+    """
+    Variant of an AUTOCOMMIT read engine for server-side cursors, which need a transaction.
+
+    On PostgreSQL it shares the engine's pool and opens READ ONLY transactions; other
+    dialects stream without one.
+    """
+    if engine.dialect.name != "postgresql":
+        return engine
+    if engine not in _stream_engines:
+        _stream_engines[engine] = engine.execution_options(isolation_level="READ COMMITTED", postgresql_readonly=True)
+    return _stream_engines[engine]
+
+class RoutingSession(Session):
+    """
+    Session sending reads to AUTOCOMMIT read engines and everything else to the primary.
+
+    Reads executed with bind_arguments=REPLICA_READ (or REPLICA_STREAM) go to the replica
+    engine when one is configured, other reads to Database.read_engine. Once the session
+    has written (flushed, or run anything but a plain SELECT) its later reads go to the
+    primary transaction too, so a request always sees its own writes despite replication
+    lag, and reads that must lock rows share the transaction of the writes they guard.
+    """
+
+    def get_bind(self, mapper=None, *, clause=None, replica=False, stream=False, **kw):
+        if self._flushing or not is_read(clause):
+            self.info["wrote"] = True
+        elif not self.info.get("wrote"):
+            engine = Database.replica_engine if replica and Database.replica_engine is not None else Database.read_engine
+            if engine is not None:
+                return stream_engine(engine.sync_engine) if stream else engine.sync_engine
+        return super().get_bind(mapper, clause=clause, **kw)
+
 class Database:
+    """Owns the application's async engines (primary, its read engine and optional read replica) and session factory."""
     engine = None
+    read_engine = None
+    replica_engine = None
+    session_factory = None
     debug = False
-    
+
     @classmethod
-    def initialize(cls, database_url, debug=False):
-        """Initialize the database connection."""
-        cls.engine = create_async_engine(database_url, echo=debug)
+    def initialize(cls, database_url, debug=False, echo=False, pool_size=5, max_overflow=10,
+                   pool_timeout=30.0, pool_recycle=1800, pool_pre_ping=True, statement_cache_size=100,
+                   replica_url: Optional[str] = None):
+        """
+        Initialize the database connection, plus a replica engine if replica_url is given.
+
+        Reads get AUTOCOMMIT engines with their own pools, sized like the primary's: the
+        primary's read_engine, or the replica engine. A session that reads before writing
+        holds one connection from each pool, and never waits on the read pool while
+        holding a write connection, so the pools cannot starve each other.
+        """
+        def create_engine(url, **kw):
+            connect_args = {}
+            if make_url(url).get_driver_name() == "asyncpg":
+                # asyncpg's own cache plus SQLAlchemy's prepared statement cache; set to 0 behind pgbouncer
+                connect_args = {
+                    "statement_cache_size": statement_cache_size,
+                    "prepared_statement_cache_size": statement_cache_size,
+                }
+            return create_async_engine(
+                url,
+                echo=echo,
+                poolclass=InstrumentedAsyncQueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_recycle=pool_recycle,
+                pool_pre_ping=pool_pre_ping,
+                connect_args=connect_args,
+                **kw,
+            )
+
+        cls.engine = create_engine(database_url)
+        cls.read_engine = create_engine(database_url, isolation_level="AUTOCOMMIT")
+        cls.replica_engine = create_engine(replica_url, isolation_level="AUTOCOMMIT") if replica_url else None
+        cls.session_factory = async_sessionmaker(cls.engine, class_=AsyncSession, sync_session_class=RoutingSession,
+                                                 expire_on_commit=False)
         cls.debug = debug
-    
+
+    @classmethod
+    async def dispose(cls):
+        """Close all pooled connections. Called on application shutdown."""
+        for engine in (cls.engine, cls.read_engine, cls.replica_engine):
+            if engine is not None:
+                await engine.dispose()
+        cls.engine = None
+        cls.read_engine = None
+        cls.replica_engine = None
+        cls.session_factory = None
+
+    @classmethod
+    def pool_status(cls) -> Dict[str, Any]:
+        """Snapshot of pool utilization and checkout wait times."""
+        if cls.engine is None:
+            return {}
+        pool = cls.engine.pool
+        capacity = pool.size() + pool._max_overflow
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "utilization": pool.checkedout() / capacity if capacity > 0 else 0.0,
+            "checkouts": pool_stats.checkouts,
+            "checkout_timeouts": pool_stats.timeouts,
+            "total_checkout_wait_seconds": pool_stats.total_wait_seconds,
+            "max_checkout_wait_seconds": pool_stats.max_wait_seconds,
+        }
+
     @classmethod
     async def get_session(cls):
         """Get a database session."""
-        if cls.engine is None:
+        if cls.session_factory is None:
             raise Exception("Database not initialized")
-        
-        async_session = sessionmaker(
-            cls.engine, class_=AsyncSession, expire_on_commit=False
-        )
-        async with async_session() as session:
+
+        async with cls.session_factory() as session:
             try:
                 yield session
             finally:
@@ -41,8 +189,5 @@ async def get_db():
     """
     Get database session.
     """
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
\ No newline at end of file
+    async for session in Database.get_session():
+        yield session
@@ -1,29 +1,38 @@
 # app/dependencies.py
+from functools import lru_cache
+from typing import List
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.principal_cache import Principal, principal_cache
 from app.utils.security import verify_token
 from app.database import get_db
 from app.services.email_service import EmailService
+from app.utils.template_manager import TemplateManager
 from app.core.config import get_settings
 
 # OAuth2 password bearer token scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-def get_email_service():
-    """Get email service instance."""
-    return EmailService()
+@lru_cache()
+def get_email_service() -> EmailService:
+    """Get the shared email service instance; its send queue is started in the app lifespan."""
+    return EmailService(template_manager=TemplateManager())
 
 async def get_current_user(db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)):
     """
     Dependency to get the current authenticated user.
+
+    The user is loaded as a slim Principal and cached by id, so repeated requests
+    with the same token do not hit the database until the entry expires or
+    UserService invalidates it.
     
     Args:
         db: Database session
         token: JWT token from authorization header
         
     Returns:
-        User: Current authenticated user
+        Principal: Current authenticated user
         
     Raises:
         HTTPException: If token is invalid or user not found
@@ -46,27 +55,31 @@ async def get_current_user(db: AsyncSession = Depends(get_db), token: str = Depe
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Import UserService here to avoid circular import
-    from app.services.user_service import UserService
-    
-    # Get the user from the database
-    user = await UserService.get_by_id(db, user_id)
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        # Import UserService here to avoid circular import
+        from app.services.user_service import UserService
+
+        # Read the primary: a lagging replica could refill the cache with a stale role or lock state
+        user = await UserService.get_by_id(db, user_id, replica=False)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        principal = Principal.from_user(user)
+        principal_cache.set(principal)
     
     # Check if user is active
-    if not user.email_verified:
+    if not principal.email_verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email not verified",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    return user
+    return principal
 
 async def get_current_active_user(current_user = Depends(get_current_user)):
     """
@@ -86,4 +99,26 @@ async def get_current_active_user(current_user = Depends(get_current_user)):
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is locked",
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+def require_role(roles: List[str]):
+    """
+    Build a dependency that only admits users whose role is in roles.
+
+    Args:
+        roles: Allowed role names, e.g. ["ADMIN", "MANAGER"]
+
+    Returns:
+        Callable: Dependency returning the current principal
+
+    Raises:
+        HTTPException: If the user's role is not allowed
+    """
+    async def role_checker(current_user: Principal = Depends(get_current_user)):
+        if current_user.role.name not in roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Operation not permitted",
+            )
+        return current_user
+    return role_checker
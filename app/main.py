@@ -1,11 +1,54 @@
 from builtins import Exception
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from starlette.responses import JSONResponse
 from app.database import Database
-from app.dependencies import get_settings
-from app.routers import user_routes
+from app.dependencies import get_email_service
+from app.routers import metrics_routes, user_routes
 from app.utils.api_description import getDescription
+from app.utils.link_generation import link_templates
+from app.utils.metrics import MetricsMiddleware, instrument_engine, registry
+from app.utils.principal_cache import principal_cache
+from app.utils.query_stats import QueryStatsMiddleware, instrument_query_stats
+from app.utils.rate_limit import MemoryRateLimitBackend, RateLimitMiddleware, parse_route_limits
+from app.utils.security import PasswordHashQueueFull, password_hash_pool
 from fastapi.openapi.utils import get_openapi
+from settings.config import settings
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    Database.initialize(
+        settings.database_url,
+        settings.debug,
+        echo=settings.db_echo,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        statement_cache_size=settings.db_statement_cache_size,
+        replica_url=settings.database_replica_url,
+    )
+    engines = [engine for engine in (Database.engine, Database.read_engine, Database.replica_engine) if engine is not None]
+    if settings.metrics_enabled:
+        for engine in engines:
+            instrument_engine(engine)
+    if settings.query_stats_enabled:
+        for engine in engines:
+            instrument_query_stats(engine, settings.db_slow_query_seconds)
+    password_hash_pool.start(
+        executor_type=settings.password_hash_executor,
+        max_workers=settings.password_hash_workers,
+        max_queue=settings.password_hash_max_queue,
+    )
+    email_service = get_email_service()
+    await email_service.start()
+    try:
+        yield
+    finally:
+        await email_service.stop()
+        password_hash_pool.shutdown()
+        await Database.dispose()
 
 app = FastAPI(
     title="User Management",
@@ -17,18 +60,45 @@ app = FastAPI(
         "email": "support@example.com",
     },
     license_info={"name": "MIT", "url": "https://opensource.org/licenses/MIT"},
+    lifespan=lifespan,
 )
 
-@app.on_event("startup")
-async def startup_event():
-    settings = get_settings()
-    Database.initialize(settings.database_url, settings.debug)
+@app.exception_handler(PasswordHashQueueFull)
+async def password_hash_queue_full_handler(request, exc):
+    return JSONResponse(status_code=503, content={"message": "Server is busy, please retry shortly."}, headers={"Retry-After": "1"})
 
 @app.exception_handler(Exception)
 async def exception_handler(request, exc):
     return JSONResponse(status_code=500, content={"message": "An unexpected error occurred."})
 
 app.include_router(user_routes.router)
+# Link paths are compiled once here rather than looked up per link
+link_templates.compile(app)
+
+if settings.query_stats_enabled:
+    app.add_middleware(
+        QueryStatsMiddleware,
+        n_plus_one_threshold=settings.db_n_plus_one_threshold,
+        expose_headers=settings.debug,
+    )
+
+rate_limit_backend = MemoryRateLimitBackend(max_keys=settings.rate_limit_max_keys)
+if settings.rate_limit_enabled:
+    app.add_middleware(
+        RateLimitMiddleware,
+        limits=parse_route_limits(settings.rate_limits),
+        backend=rate_limit_backend,
+        trusted_proxies=settings.rate_limit_trusted_proxies,
+    )
+
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_routes.router)
+    registry.register_collector("db_pool", Database.pool_status)
+    registry.register_collector("password_hash_pool", password_hash_pool.stats)
+    registry.register_collector("email", lambda: get_email_service().stats())
+    registry.register_collector("principal_cache", principal_cache.stats)
+    registry.register_collector("rate_limit", rate_limit_backend.stats)
 
 # Custom OpenAPI schema to add security definitions for Swagger UI
 def custom_openapi():
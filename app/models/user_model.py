@@ -3,7 +3,7 @@ from datetime import datetime
 from enum import Enum
 import uuid
 from sqlalchemy import (
-    Column, String, Integer, DateTime, Boolean, func, Enum as SQLAlchemyEnum
+    DDL, Column, String, Integer, DateTime, Boolean, Index, event, func, text, Enum as SQLAlchemyEnum
 )
 from sqlalchemy.dialects.postgresql import UUID, ENUM
 from sqlalchemy.orm import Mapped, mapped_column
@@ -16,6 +16,13 @@ class UserRole(Enum):
     MANAGER = "MANAGER"
     ADMIN = "ADMIN"
 
+# Full-text document searched by GET /users/search. Queries must use this exact
+# expression (with literals, not bound parameters) to match ix_users_search_document.
+USER_SEARCH_DOCUMENT = (
+    "to_tsvector('simple'::regconfig, coalesce(nickname, '') || ' ' || coalesce(email, '') || ' ' || "
+    "coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || coalesce(bio, ''))"
+)
+
 class User(Base):
     """
     Represents a user within the application, corresponding to the 'users' table in the database.
@@ -52,6 +59,23 @@ class User(Base):
     """
     __tablename__ = "users"
     __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Supports keyset pagination ordered on (created_at, id)
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Support filtered and sorted listings (USER_SORT_FIELDS and UserService._user_filters)
+        Index("ix_users_last_login_at_id", "last_login_at", "id"),
+        Index("ix_users_role_created_at_id", "role", "created_at", "id"),
+        Index("ix_users_role_last_login_at_id", "role", "last_login_at", "id"),
+        Index("ix_users_locked_created_at_id", "created_at", "id", postgresql_where=text("is_locked")),
+        Index("ix_users_unverified_created_at_id", "created_at", "id", postgresql_where=text("NOT email_verified")),
+        Index("ix_users_professional_created_at_id", "created_at", "id", postgresql_where=text("is_professional")),
+        # Support user search: full-text over all searchable fields, trigram for substring matches
+        Index("ix_users_search_document", text(USER_SEARCH_DOCUMENT), postgresql_using="gin"),
+        *(
+            Index(f"ix_users_{column}_trgm", column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+            for column in ("nickname", "email", "first_name", "last_name")
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     nickname: Mapped[str] = Column(String(50), unique=True, nullable=False, index=True)
@@ -95,3 +119,9 @@ class User(Base):
         """Updates the professional status and logs the update time."""
         self.is_professional = status
         self.professional_status_updated_at = func.now()
+
+# The trigram indexes need pg_trgm before the table is created (e.g. by create_all in tests)
+event.listen(
+    User.__table__, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,22 @@
+from builtins import str
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from app.utils.metrics import registry
+from settings.config import settings
+
+router = APIRouter()
+
+def require_metrics_token(authorization: Optional[str] = Header(None)) -> None:
+    """Admit scrapers sending settings.metrics_token as a bearer token; without a token configured /metrics is not served."""
+    if not settings.metrics_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    expected = f"Bearer {settings.metrics_token}"
+    if authorization is None or not secrets.compare_digest(authorization.encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token", headers={"WWW-Authenticate": "Bearer"})
+
+@router.get("/metrics", response_class=PlainTextResponse, name="metrics", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+async def metrics():
+    """Expose collected metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
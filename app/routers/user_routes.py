@@ -18,62 +18,138 @@ Key Highlights:
 - Utilizes OAuth2PasswordBearer for securing API endpoints, requiring valid access tokens for operations.
 """
 
-from builtins import dict, int, len, str
-from datetime import timedelta
+from builtins import ValueError, dict, int, len, list, str, sum
+from datetime import datetime, timedelta
+from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Response, status, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies import get_current_user, get_db, get_email_service, require_role
 from app.schemas.pagination_schema import EnhancedPagination
 from app.schemas.token_schema import TokenResponse
-from app.schemas.user_schemas import LoginRequest, UserBase, UserCreate, UserListResponse, UserResponse, UserUpdate
-from app.services.user_service import UserService
+from app.schemas.user_schemas import LoginRequest, UserBase, UserBulkRequest, UserBulkResponse, UserBulkRoleRequest, UserCreate, UserImportResponse, UserListResponse, UserResponse, UserUpdate
+from app.models.user_model import UserRole
+from app.services.user_service import EXPORTABLE_USER_FIELDS, UserConflictError, UserModifiedError, UserService
 from app.services.jwt_service import create_access_token
-from app.utils.link_generation import create_user_links, generate_pagination_links
-from app.dependencies import get_settings
+from app.utils.cursor import encode_cursor
+from app.utils.etag import if_match_versions, if_none_match as etag_if_none_match, page_etag, user_etag
+from app.utils.serialization import user_list_payload, user_payload
+from app.utils.link_generation import create_user_links, generate_cursor_pagination_links, generate_pagination_links, link_base_url
+from app.utils.stream_export import iter_csv, iter_ndjson
+from app.utils.stream_parsing import iter_csv_rows, iter_ndjson_rows
 from app.services.email_service import EmailService
+from settings.config import settings
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="login",
     description="OAuth2 password flow bearer token",
     scheme_name="Bearer Authentication"
 )
-settings = get_settings()
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": settings.user_cache_control}
+
+def not_modified(etag: str) -> Response:
+    """304 for a matching If-None-Match: headers only, nothing serialized."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
+
+def conflict_error(error: UserConflictError) -> HTTPException:
+    """400 for an email or nickname already used by another user."""
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{error.field.capitalize()} already exists")
+
+@router.get("/users/export", name="export_users", tags=["User Management Requires (Admin Role)"])
+async def export_users(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to export; defaults to all exportable columns."),
+    role: Optional[UserRole] = None,
+    is_locked: Optional[bool] = None,
+    email_verified: Optional[bool] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(require_role(["ADMIN"]))
+):
+    """
+    Stream the user table as NDJSON or CSV.
+
+    Rows are read through a server-side cursor and written out as they arrive, with no
+    pagination, counting or HATEOAS links, so exports of any size use constant memory.
+    """
+    selected = [field.strip() for field in fields.split(",") if field.strip()] if fields else list(EXPORTABLE_USER_FIELDS)
+    unknown = [field for field in selected if field not in EXPORTABLE_USER_FIELDS]
+    if not selected or unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown export fields: {', '.join(unknown)}")
+
+    rows = UserService.stream_users(
+        db, selected, role=role, is_locked=is_locked, email_verified=email_verified,
+        created_after=created_after, created_before=created_before,
+    )
+    batch_size = settings.user_export_batch_size
+    if format == "csv":
+        body, media_type = iter_csv(rows, selected, batch_size), "text/csv"
+    else:
+        body, media_type = iter_ndjson(rows, selected, batch_size), "application/x-ndjson"
+    return StreamingResponse(body, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="users.{format}"'})
+
+@router.get("/users/search", response_model=UserListResponse, name="search_users", tags=["User Management Requires (Admin or Manager Roles)"])
+async def search_users(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100, description="Text to find in nickname, email, first name, last name or bio."),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    links: bool = Query(True, description="Set to false to omit HATEOAS links from the response."),
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))
+):
+    """
+    Search users, best matches first.
+
+    Matching and ranking run on the users search indexes (full-text and trigram). Results
+    are keyset-paginated: follow `next_cursor` (or the `next` link) for further pages.
+    """
+    try:
+        users, next_cursor = await UserService.search(db, q, limit, cursor or None)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+    if not links:
+        return ORJSONResponse(user_list_payload(users, [], next_cursor=next_cursor))
+    base_url = link_base_url(request)
+    return ORJSONResponse(user_list_payload(
+        users,
+        generate_cursor_pagination_links(request, limit, cursor, next_cursor, None, params={"q": q}),
+        next_cursor=next_cursor,
+        item_links=lambda user: create_user_links(user.id, request, base_url),
+    ))
+
 @router.get("/users/{user_id}", response_model=UserResponse, name="get_user", tags=["User Management Requires (Admin or Manager Roles)"])
-async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+async def get_user(user_id: UUID, request: Request, links: bool = True, if_none_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
     """
     Endpoint to fetch a user by their unique identifier (UUID).
 
     Utilizes the UserService to query the database asynchronously for the user and constructs a response
     model that includes the user's details along with HATEOAS links for possible next actions.
 
+    The response carries a strong ETag derived from the user's updated_at; send it back in
+    If-None-Match to get a 304 with no body while the user is unchanged.
+
     Args:
         user_id: UUID of the user to fetch.
         request: The request object, used to generate full URLs in the response.
         db: Dependency that provides an AsyncSession for database access.
         token: The OAuth2 access token obtained through OAuth2PasswordBearer dependency.
     """
-    user = await UserService.get_by_id(db, user_id)
+    user = await UserService.get_by_id(db, user_id, replica=True)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    return UserResponse.model_construct(
-        id=user.id,
-        nickname=user.nickname,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        bio=user.bio,
-        profile_picture_url=user.profile_picture_url,
-        github_profile_url=user.github_profile_url,
-        linkedin_profile_url=user.linkedin_profile_url,
-        role=user.role,
-        email=user.email,
-        last_login_at=user.last_login_at,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-        links=create_user_links(user.id, request)  
-    )
+    etag = user_etag(user.updated_at, links)
+    if etag_if_none_match(if_none_match, etag):
+        return not_modified(etag)
+    return ORJSONResponse(user_payload(user, create_user_links(user.id, request) if links else None), headers=cache_headers(etag))
 
 # Additional endpoints for update, delete, create, and list users follow a similar pattern, using
 # asynchronous database operations, handling security with OAuth2PasswordBearer, and enhancing response
@@ -83,33 +159,29 @@ async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(g
 # experience by adhering to REST principles and providing self-discoverable operations.
 
 @router.put("/users/{user_id}", response_model=UserResponse, name="update_user", tags=["User Management Requires (Admin or Manager Roles)"])
-async def update_user(user_id: UUID, user_update: UserUpdate, request: Request, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+async def update_user(user_id: UUID, user_update: UserUpdate, request: Request, links: bool = True, if_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
     """
     Update user information.
 
     - **user_id**: UUID of the user to update.
     - **user_update**: UserUpdate model with updated user information.
+    - **If-Match** header: an ETag from a previous GET; the update is rejected with 412
+      if the user has changed since.
+
+    A new email or nickname already used by another user is rejected with 400.
     """
     user_data = user_update.model_dump(exclude_unset=True)
-    updated_user = await UserService.update(db, user_id, user_data)
+    try:
+        updated_user = await UserService.update(db, user_id, user_data, expected_updated_at=if_match_versions(if_match))
+    except UserConflictError as e:
+        raise conflict_error(e)
+    except UserModifiedError:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="User has been modified")
     if not updated_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    return UserResponse.model_construct(
-        id=updated_user.id,
-        bio=updated_user.bio,
-        first_name=updated_user.first_name,
-        last_name=updated_user.last_name,
-        nickname=updated_user.nickname,
-        email=updated_user.email,
-        last_login_at=updated_user.last_login_at,
-        profile_picture_url=updated_user.profile_picture_url,
-        github_profile_url=updated_user.github_profile_url,
-        linkedin_profile_url=updated_user.linkedin_profile_url,
-        created_at=updated_user.created_at,
-        updated_at=updated_user.updated_at,
-        links=create_user_links(updated_user.id, request)
-    )
+    return ORJSONResponse(user_payload(updated_user, create_user_links(updated_user.id, request) if links else None),
+                          headers=cache_headers(user_etag(updated_user.updated_at, links)))
 
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT, name="delete_user", tags=["User Management Requires (Admin or Manager Roles)"])
@@ -127,12 +199,12 @@ async def delete_user(user_id: UUID, db: AsyncSession = Depends(get_db), token:
 
 
 @router.post("/users/", response_model=UserResponse, status_code=status.HTTP_201_CREATED, tags=["User Management Requires (Admin or Manager Roles)"], name="create_user")
-async def create_user(user: UserCreate, request: Request, db: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+async def create_user(user: UserCreate, request: Request, links: bool = True, db: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
     """
     Create a new user.
 
-    This endpoint creates a new user with the provided information. If the email
-    already exists, it returns a 400 error. On successful creation, it returns the
+    This endpoint creates a new user with the provided information. If the email or
+    nickname already exists, it returns a 400 error. On successful creation, it returns the
     newly created user's information along with links to related actions.
 
     Parameters:
@@ -143,28 +215,105 @@ async def create_user(user: UserCreate, request: Request, db: AsyncSession = Dep
     Returns:
     - UserResponse: The newly created user's information along with navigation links.
     """
-    existing_user = await UserService.get_by_email(db, user.email)
-    if existing_user:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists")
-    
-    created_user = await UserService.create(db, user.model_dump(), email_service)
+    try:
+        created_user = await UserService.create(db, user.model_dump(), email_service, raise_conflicts=True)
+    except UserConflictError as e:
+        raise conflict_error(e)
     if not created_user:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create user")
     
     
-    return UserResponse.model_construct(
-        id=created_user.id,
-        bio=created_user.bio,
-        first_name=created_user.first_name,
-        last_name=created_user.last_name,
-        profile_picture_url=created_user.profile_picture_url,
-        nickname=created_user.nickname,
-        email=created_user.email,
-        last_login_at=created_user.last_login_at,
-        created_at=created_user.created_at,
-        updated_at=created_user.updated_at,
-        links=create_user_links(created_user.id, request)
-    )
+    return ORJSONResponse(user_payload(created_user, create_user_links(created_user.id, request) if links else None), status_code=status.HTTP_201_CREATED)
+
+
+@router.post("/users/import", response_model=UserImportResponse, name="import_users", tags=["User Management Requires (Admin or Manager Roles)"])
+async def import_users(request: Request, db: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+    """
+    Bulk-create users from a streamed upload.
+
+    Send the body as NDJSON (`application/x-ndjson`, one UserCreate object per line) or
+    CSV (`text/csv`, header row with UserCreate field names). The body is parsed as it
+    arrives and processed in batches; each row gets a result of `created`, `invalid` or
+    `duplicate`. Verification emails are queued, not sent inline.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        rows = iter_ndjson_rows(request.stream())
+    elif content_type == "text/csv":
+        rows = iter_csv_rows(request.stream())
+    else:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Upload NDJSON (application/x-ndjson) or CSV (text/csv)")
+
+    results = []
+    batch = []
+    async for row_number, data, error in rows:
+        if error:
+            results.append({"row": row_number, "status": "invalid", "errors": [error]})
+            continue
+        batch.append((row_number, data))
+        if len(batch) >= settings.user_import_batch_size:
+            results.extend(await UserService.bulk_create(db, batch, email_service))
+            batch = []
+    if batch:
+        results.extend(await UserService.bulk_create(db, batch, email_service))
+
+    results.sort(key=lambda result: result["row"])
+    created = sum(1 for result in results if result["status"] == "created")
+    return UserImportResponse(created=created, failed=len(results) - created, results=results)
+
+
+def bulk_response(results: Optional[list]) -> ORJSONResponse:
+    if results is None:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Bulk operation failed")
+    not_found = sum(1 for result in results if result["status"] == "not_found")
+    return ORJSONResponse({"affected": len(results) - not_found, "not_found": not_found, "results": results})
+
+def check_bulk_size(bulk: UserBulkRequest):
+    if len(bulk.ids) > settings.user_bulk_max_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {settings.user_bulk_max_ids} ids per request")
+
+
+@router.post("/users/bulk/role", response_model=UserBulkResponse, name="bulk_set_role", tags=["User Management Requires (Admin Role)"])
+async def bulk_set_role(bulk: UserBulkRoleRequest, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN"]))):
+    """
+    Give every listed user the same role in one UPDATE. Admins only.
+
+    Each id gets a result of `updated` or `not_found`.
+    """
+    check_bulk_size(bulk)
+    return bulk_response(await UserService.bulk_set_role(db, bulk.ids, bulk.role))
+
+
+@router.post("/users/bulk/lock", response_model=UserBulkResponse, name="bulk_lock_users", tags=["User Management Requires (Admin or Manager Roles)"])
+async def bulk_lock_users(bulk: UserBulkRequest, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+    """Lock every listed account in one UPDATE."""
+    check_bulk_size(bulk)
+    return bulk_response(await UserService.bulk_lock(db, bulk.ids))
+
+
+@router.post("/users/bulk/unlock", response_model=UserBulkResponse, name="bulk_unlock_users", tags=["User Management Requires (Admin or Manager Roles)"])
+async def bulk_unlock_users(bulk: UserBulkRequest, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+    """Unlock every listed account and reset its failed login attempts in one UPDATE."""
+    check_bulk_size(bulk)
+    return bulk_response(await UserService.bulk_unlock(db, bulk.ids))
+
+
+@router.post("/users/bulk/verify", response_model=UserBulkResponse, name="bulk_verify_users", tags=["User Management Requires (Admin or Manager Roles)"])
+async def bulk_verify_users(bulk: UserBulkRequest, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+    """Mark every listed user's email as verified in one UPDATE; ANONYMOUS users become AUTHENTICATED."""
+    check_bulk_size(bulk)
+    return bulk_response(await UserService.bulk_verify_email(db, bulk.ids))
+
+
+@router.post("/users/bulk/delete", response_model=UserBulkResponse, name="bulk_delete_users", tags=["User Management Requires (Admin or Manager Roles)"])
+async def bulk_delete_users(bulk: UserBulkRequest, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+    """
+    Delete every listed user in one DELETE.
+
+    Each id gets a result of `deleted` or `not_found`.
+    """
+    check_bulk_size(bulk)
+    return bulk_response(await UserService.bulk_delete(db, bulk.ids))
 
 
 @router.get("/users/", response_model=UserListResponse, tags=["User Management Requires (Admin or Manager Roles)"])
@@ -172,41 +321,113 @@ async def list_users(
     request: Request,
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    role: Optional[UserRole] = None,
+    is_locked: Optional[bool] = None,
+    email_verified: Optional[bool] = None,
+    is_professional: Optional[bool] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    last_login_after: Optional[datetime] = None,
+    last_login_before: Optional[datetime] = None,
+    sort: str = Query("created_at", description="One of created_at, last_login_at, nickname, email; prefix with '-' for descending."),
+    links: bool = Query(True, description="Set to false to omit HATEOAS links from the response."),
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))
 ):
-    total_users = await UserService.count(db)
-    users = await UserService.list_users(db, skip, limit)
-
-    user_responses = [
-        UserResponse.model_validate(user) for user in users
-    ]
-    
-    pagination_links = generate_pagination_links(request, skip, limit, total_users)
+    """
+    List users, ordered by creation time unless **sort** says otherwise.
+
+    - **skip**/**limit**: offset pagination (kept for backward compatibility).
+    - **cursor**: switches to keyset pagination. Pass an empty value (`?cursor=`) for the
+      first page, then follow `next_cursor`/`prev_cursor` from the response. Every page
+      costs the same regardless of depth. Only available with the default sort.
+    - **include_total**: set to false to skip counting users; `total` and the `last`
+      link are then omitted.
+    - **role**, **is_locked**, **email_verified**, **is_professional**, **created_after**/
+      **created_before**, **last_login_after**/**last_login_before**: filters, served by
+      indexes on the users table.
+    - **sort**: only indexed fields are accepted; anything else is rejected with 400.
+    - **links**: set to false to omit pagination and per-user links.
+
+    Pages carry a strong ETag; a matching If-None-Match gets a 304 with no body, skipping
+    serialization and link building.
+    """
+    filters = dict(
+        role=role, is_locked=is_locked, email_verified=email_verified, is_professional=is_professional,
+        created_after=created_after, created_before=created_before,
+        last_login_after=last_login_after, last_login_before=last_login_before,
+    )
+    # Filters and sort are carried over to every pagination link
+    link_params = {key: value for key, value in request.query_params.items() if key not in ("skip", "limit", "cursor")}
+    base_url = link_base_url(request) if links else None
+    item_links = (lambda user: create_user_links(user.id, request, base_url)) if links else None
+    representation = f"{link_base_url(request)}?{request.url.query}"
+
+    if cursor is not None:
+        if sort != "created_at":
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor pagination only supports sort=created_at")
+        try:
+            users, next_cursor, prev_cursor = await UserService.list_users_keyset(db, limit, cursor or None, **filters)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+        total_users = await UserService.count(db, **filters) if include_total else None
+        etag = page_etag(representation, users, total_users, next_cursor, prev_cursor)
+        if etag_if_none_match(if_none_match, etag):
+            return not_modified(etag)
+        return ORJSONResponse(user_list_payload(
+            users,
+            generate_cursor_pagination_links(request, limit, cursor, next_cursor, prev_cursor, params=link_params) if links else [],
+            total=total_users,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+            item_links=item_links,
+        ), headers=cache_headers(etag))
+
+    # Fetch one extra row to learn whether another page exists without relying on the total
+    try:
+        users = await UserService.list_users(db, skip, limit + 1, sort, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    has_more = len(users) > limit
+    users = users[:limit]
+    total_users = await UserService.count(db, **filters) if include_total else None
+    etag = page_etag(representation, users, total_users, has_more)
+    if etag_if_none_match(if_none_match, etag):
+        return not_modified(etag)
+
+    pagination_links = generate_pagination_links(request, skip, limit, total_users, has_more, params=link_params) if links else []
+    # A keyset cursor continues the listing only in its own (created_at, id) order
+    next_cursor = encode_cursor(users[-1].created_at, users[-1].id, "next") if has_more and sort == "created_at" else None
     
-    # Construct the final response with pagination details
-    return UserListResponse(
-        items=user_responses,
+    # Serialize rows straight to JSON; response_model only documents the shape
+    return ORJSONResponse(user_list_payload(
+        users,
+        pagination_links,
         total=total_users,
         page=skip // limit + 1,
-        size=len(user_responses),
-        links=pagination_links  # Ensure you have appropriate logic to create these links
-    )
+        next_cursor=next_cursor,
+        item_links=item_links,
+    ), headers=cache_headers(etag))
 
 
 @router.post("/register/", response_model=UserResponse, tags=["Login and Registration"])
 async def register(user_data: UserCreate, session: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service)):
-    user = await UserService.register_user(session, user_data.model_dump(), email_service)
+    try:
+        user = await UserService.register_user(session, user_data.model_dump(), email_service, raise_conflicts=True)
+    except UserConflictError as e:
+        raise conflict_error(e)
     if user:
-        return user
+        return ORJSONResponse(user_payload(user))
     raise HTTPException(status_code=400, detail="Email already exists")
 
 @router.post("/login/", response_model=TokenResponse, tags=["Login and Registration"])
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_db)):
-    if await UserService.is_account_locked(session, form_data.username):
+    user, locked = await UserService.authenticate(session, form_data.username, form_data.password)
+    if locked:
         raise HTTPException(status_code=400, detail="Account locked due to too many failed login attempts.")
-
-    user = await UserService.login_user(session, form_data.username, form_data.password)
     if user:
         access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
 
@@ -220,10 +441,9 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Async
 
 @router.post("/login/", include_in_schema=False, response_model=TokenResponse, tags=["Login and Registration"])
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_db)):
-    if await UserService.is_account_locked(session, form_data.username):
+    user, locked = await UserService.authenticate(session, form_data.username, form_data.password)
+    if locked:
         raise HTTPException(status_code=400, detail="Account locked due to too many failed login attempts.")
-
-    user = await UserService.login_user(session, form_data.username, form_data.password)
     if user:
         access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
 
@@ -6,6 +6,8 @@ from enum import Enum
 import uuid
 import re
 
+from app.schemas.link_schema import Link
+from app.schemas.pagination_schema import PaginationLink
 from app.utils.nickname_gen import generate_nickname
 
 class UserRole(str, Enum):
@@ -113,6 +115,7 @@ class UserResponse(UserBase):
     nickname: Optional[str] = Field(None, min_length=3, max_length=50, pattern=r'^[\w-]+$', example=generate_nickname())    
     role: UserRole = Field(default=UserRole.AUTHENTICATED, example="AUTHENTICATED")
     is_professional: Optional[bool] = Field(default=False, example=True)
+    links: Optional[List[Link]] = Field(None, description="Actions on this user; omitted with ?links=false.")
 
 class LoginRequest(BaseModel):
     email: str = Field(..., example="john.doe@example.com")
@@ -122,6 +125,33 @@ class ErrorResponse(BaseModel):
     error: str = Field(..., example="Not Found")
     details: Optional[str] = Field(None, example="The requested resource was not found.")
 
+class UserImportRowResult(BaseModel):
+    row: int = Field(..., example=1, description="1-based row number in the uploaded file.")
+    status: str = Field(..., example="created", description="One of created, invalid or duplicate.")
+    email: Optional[str] = Field(None, example="john.doe@example.com")
+    id: Optional[uuid.UUID] = Field(None, example=uuid.uuid4())
+    errors: List[str] = Field(default_factory=list)
+
+class UserImportResponse(BaseModel):
+    created: int = Field(..., example=2)
+    failed: int = Field(..., example=1)
+    results: List[UserImportRowResult]
+
+class UserBulkRequest(BaseModel):
+    ids: List[uuid.UUID] = Field(..., min_length=1, example=[uuid.uuid4()], description="Users to change; duplicates are ignored.")
+
+class UserBulkRoleRequest(UserBulkRequest):
+    role: UserRole = Field(..., example="MANAGER")
+
+class UserBulkResult(BaseModel):
+    id: uuid.UUID = Field(..., example=uuid.uuid4())
+    status: str = Field(..., example="updated", description="One of updated, deleted or not_found.")
+
+class UserBulkResponse(BaseModel):
+    affected: int = Field(..., example=2)
+    not_found: int = Field(..., example=0)
+    results: List[UserBulkResult]
+
 class UserListResponse(BaseModel):
     items: List[UserResponse] = Field(..., example=[{
         "id": uuid.uuid4(), "nickname": generate_nickname(), "email": "john.doe@example.com",
@@ -131,6 +161,9 @@ class UserListResponse(BaseModel):
         "linkedin_profile_url": "https://linkedin.com/in/johndoe", 
         "github_profile_url": "https://github.com/johndoe"
     }])
-    total: int = Field(..., example=100)
-    page: int = Field(..., example=1)
-    size: int = Field(..., example=10)
\ No newline at end of file
+    total: Optional[int] = Field(None, example=100, description="Total number of users; omitted when include_total=false.")
+    page: Optional[int] = Field(None, example=1, description="Page number; not set in cursor mode.")
+    size: int = Field(..., example=10)
+    links: List[PaginationLink] = []
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page, if there is one.")
+    prev_cursor: Optional[str] = Field(None, description="Opaque cursor for the previous page, if there is one.")
\ No newline at end of file
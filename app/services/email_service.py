@@ -1,19 +1,122 @@
 # email_service.py
-from builtins import ValueError, dict, str
+from builtins import Exception, ValueError, dict, int, len, max, range, str
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
 from settings.config import settings
+from app.utils.metrics import email_render_duration, email_send_duration
 from app.utils.smtp_connection import SMTPClient
 from app.utils.template_manager import TemplateManager
 from app.models.user_model import User
 
+logger = logging.getLogger(__name__)
+
 class EmailService:
+    """
+    Renders and sends user emails over a pool of persistent SMTP connections.
+
+    Once ``start`` has been called, messages are put on a bounded in-process queue and
+    delivered by background worker tasks with retry and exponential backoff; a full
+    queue makes callers wait (backpressure). Before ``start`` (or after ``stop``)
+    messages are sent directly.
+    """
+
     def __init__(self, template_manager: TemplateManager):
         self.smtp_client = SMTPClient(
             server=settings.smtp_server,
             port=settings.smtp_port,
             username=settings.smtp_username,
-            password=settings.smtp_password
+            password=settings.smtp_password,
+            pool_size=settings.smtp_pool_size,
+            start_tls=settings.smtp_start_tls,
+            timeout=settings.smtp_timeout_seconds,
+            idle_timeout=settings.smtp_idle_timeout_seconds,
         )
         self.template_manager = template_manager
+        self.max_retries = settings.email_max_retries
+        self.retry_backoff_seconds = settings.email_retry_backoff_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.total_send_seconds = 0.0
+        self.max_send_seconds = 0.0
+
+    async def start(self, workers: Optional[int] = None, queue_maxsize: Optional[int] = None):
+        """Create the send queue and its worker tasks. Called from the application lifespan."""
+        if self._queue is not None:
+            return
+        workers = workers or settings.email_workers
+        queue_maxsize = queue_maxsize if queue_maxsize is not None else settings.email_queue_maxsize
+        self._queue = asyncio.Queue(maxsize=queue_maxsize)
+        self._workers = [asyncio.create_task(self._worker(self._queue), name=f"email-worker-{i}") for i in range(workers)]
+
+    async def stop(self, timeout: Optional[float] = None):
+        """Flush pending messages, then stop the workers and close the SMTP connections."""
+        if self._queue is None:
+            await self.smtp_client.close()
+            return
+        queue, self._queue = self._queue, None
+        timeout = timeout if timeout is not None else settings.email_shutdown_timeout_seconds
+        try:
+            await asyncio.wait_for(queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Email queue not drained on shutdown; {queue.qsize()} message(s) dropped")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        await self.smtp_client.close()
+
+    async def _send(self, subject: str, html_content: str, recipient: str):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            await self.smtp_client.send_email(subject, html_content, recipient)
+            outcome = "sent"
+        finally:
+            elapsed = time.perf_counter() - started
+            self.total_send_seconds += elapsed
+            self.max_send_seconds = max(self.max_send_seconds, elapsed)
+            email_send_duration.observe(elapsed, outcome=outcome)
+        self.sent += 1
+
+    async def _deliver(self, message: Tuple[str, str, str]):
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self._send(*message)
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.failed += 1
+                    logger.error(f"Giving up on email to {message[2]} after {attempt + 1} attempts: {e}")
+                    return
+                self.retried += 1
+                await asyncio.sleep(self.retry_backoff_seconds * (2 ** attempt))
+
+    async def _worker(self, queue: asyncio.Queue):
+        # The queue is passed in because stop() clears self._queue before a new worker may have run
+        while True:
+            message = await queue.get()
+            try:
+                await self._deliver(message)
+            finally:
+                queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth and send latency counters."""
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "workers": len(self._workers),
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "total_send_seconds": self.total_send_seconds,
+            "max_send_seconds": self.max_send_seconds,
+            **self.smtp_client.stats(),
+        }
 
     async def send_user_email(self, user_data: dict, email_type: str):
         subject_map = {
@@ -25,8 +128,13 @@ class EmailService:
         if email_type not in subject_map:
             raise ValueError("Invalid email type")
 
-        html_content = self.template_manager.render_template(email_type, **user_data)
-        self.smtp_client.send_email(subject_map[email_type], html_content, user_data['email'])
+        with email_render_duration.time(template=email_type):
+            html_content = self.template_manager.render_template(email_type, **user_data)
+        message = (subject_map[email_type], html_content, user_data['email'])
+        if self._queue is not None:
+            await self._queue.put(message)
+        else:
+            await self._send(*message)
 
     async def send_verification_email(self, user: User):
         verification_url = f"{settings.server_base_url}verify-email/{user.id}/{user.verification_token}"
@@ -34,4 +142,4 @@ class EmailService:
             "name": user.first_name,
             "verification_url": verification_url,
             "email": user.email
-        }, 'email_verification')
\ No newline at end of file
+        }, 'email_verification')
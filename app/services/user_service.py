@@ -1,25 +1,69 @@
-from builtins import Exception, bool, classmethod, int, str
+from builtins import Exception, ValueError, bool, classmethod, dict, int, len, list, next, range, set, staticmethod, str, super, zip
+import asyncio
 from datetime import datetime, timezone
 import secrets
-from typing import Optional, Dict, List
+from typing import Any, AsyncIterator, Optional, Dict, List, Sequence, Set, Tuple
 from pydantic import ValidationError
-from sqlalchemy import func, null, update, select
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import Float, any_, bindparam, case, cast, delete, func, literal, literal_column, not_, null, or_, update, select, text, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.config import get_settings
-from app.models.user_model import User
+from app.database import REPLICA_READ, REPLICA_STREAM
+from app.models.user_model import USER_SEARCH_DOCUMENT, User
 from app.schemas.user_schemas import UserCreate, UserUpdate
-from app.utils.nickname_gen import generate_nickname
-from app.utils.security import generate_verification_token, hash_password, verify_password
-from uuid import UUID
+from app.utils.cursor import decode_cursor, decode_rank_cursor, encode_cursor, encode_rank_cursor
+from app.utils.nickname_gen import generate_nicknames
+from app.utils.principal_cache import principal_cache
+from app.utils.security import generate_verification_token, hash_password_async, verify_password_async
+from uuid import UUID, uuid4
 from app.services.email_service import EmailService
 from app.models.user_model import UserRole
+from settings.config import settings
 import logging
 
-settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Columns that may be selected for export; credentials and tokens are never exported
+EXPORTABLE_USER_FIELDS = (
+    "id", "nickname", "email", "first_name", "last_name", "bio", "profile_picture_url",
+    "linkedin_profile_url", "github_profile_url", "role", "is_professional",
+    "professional_status_updated_at", "last_login_at", "failed_login_attempts", "is_locked",
+    "email_verified", "created_at", "updated_at",
+)
+
+# Sort keys accepted by list_users ('-' prefix for descending), each backed by an index
+USER_SORT_FIELDS = {
+    "created_at": (User.created_at, User.id),
+    "last_login_at": (User.last_login_at, User.id),
+    "nickname": (User.nickname,),
+    "email": (User.email,),
+}
+
+# Generated nickname candidates checked per pending user in each IN query
+NICKNAME_CANDIDATES_PER_ROW = 4
+# Inserts retried when a generated nickname loses a race to a concurrent registration
+NICKNAME_INSERT_ATTEMPTS = 3
+
+# asyncpg binds at most 32767 parameters per statement, so multi-row INSERTs are split below it
+MAX_BIND_PARAMETERS = 32767
+
+# Unique indexes on users, by the field a violation of each means is taken
+USER_UNIQUE_INDEXES = {"ix_users_email": "email", "ix_users_nickname": "nickname"}
+
+class UserConflictError(ValueError):
+    """An email or nickname is already used by another user."""
+
+    def __init__(self, field: str):
+        super().__init__(f"{field} already exists")
+        self.field = field
+
+class UserModifiedError(ValueError):
+    """A conditional update found the user changed since the version the client holds."""
+
 class UserService:
+    # Whether table_row_counts exists, looked up by the first counter count
+    _row_counter_migrated: Optional[bool] = None
+
     @classmethod
     async def _execute_query(cls, session: AsyncSession, query):
         try:
@@ -32,14 +76,40 @@ class UserService:
             return None
 
     @classmethod
-    async def _fetch_user(cls, session: AsyncSession, **filters) -> Optional[User]:
+    async def _read(cls, session: AsyncSession, query, replica: bool = False):
+        """
+        Run a SELECT without committing.
+
+        Under RoutingSession a read runs on an AUTOCOMMIT connection (Database.read_engine,
+        or the replica with replica=True), so it sends no BEGIN, COMMIT or ROLLBACK and
+        leaves no transaction open while the request goes on. Streamed reads, whose
+        server-side cursors need a transaction, run in a READ ONLY one instead. Any
+        statement other than a plain SELECT (DML, including through text(), or a locking
+        SELECT) marks the session as written, and its reads then join the primary
+        transaction so it sees its own writes.
+        """
+        try:
+            return await session.execute(query, bind_arguments=REPLICA_READ if replica else None)
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {e}")
+            await session.rollback()
+            return None
+
+    @classmethod
+    async def _fetch_user(cls, session: AsyncSession, replica: bool = False, **filters) -> Optional[User]:
         query = select(User).filter_by(**filters)
-        result = await cls._execute_query(session, query)
+        result = await cls._read(session, query, replica)
         return result.scalars().first() if result else None
 
     @classmethod
-    async def get_by_id(cls, session: AsyncSession, user_id: UUID) -> Optional[User]:
-        return await cls._fetch_user(session, id=user_id)
+    async def get_by_id(cls, session: AsyncSession, user_id: UUID, replica: bool = False) -> Optional[User]:
+        """
+        Load a user from the primary, or from the read replica with replica=True.
+
+        Only pass replica=True where a lagging copy is harmless: lookups that feed a cache
+        or a write decision (authentication, preconditions) must see the latest row.
+        """
+        return await cls._fetch_user(session, replica, id=user_id)
 
     @classmethod
     async def get_by_nickname(cls, session: AsyncSession, nickname: str) -> Optional[User]:
@@ -50,136 +120,577 @@ class UserService:
         return await cls._fetch_user(session, email=email)
 
     @classmethod
-    async def create(cls, session: AsyncSession, user_data: Dict[str, str], email_service: EmailService) -> Optional[User]:
+    async def create(cls, session: AsyncSession, user_data: Dict[str, str], email_service: EmailService,
+                     raise_conflicts: bool = False) -> Optional[User]:
+        """
+        Create a user with a single INSERT ... ON CONFLICT (email) DO NOTHING RETURNING.
+
+        Email and nickname uniqueness is enforced by their unique indexes rather than
+        checked beforehand, so concurrent registrations cannot slip between a check and
+        the insert. A generated nickname that collides is replaced and the insert retried.
+
+        :param raise_conflicts: Raise UserConflictError for a taken email or nickname
+            instead of returning None.
+        """
         try:
             validated_data = UserCreate(**user_data).model_dump()
-            
-            # Check for existing email
-            existing_user = await cls.get_by_email(session, validated_data['email'])
-            if existing_user:
-                logger.error("User with given email already exists.")
-                return None
-            
-            # Check for existing nickname if provided
-            if 'nickname' in validated_data and validated_data['nickname']:
-                existing_nickname = await cls.get_by_nickname(session, validated_data['nickname'])
-                if existing_nickname:
-                    logger.error("User with given nickname already exists.")
-                    return None
-                    
-            validated_data['hashed_password'] = hash_password(validated_data.pop('password'))
-            new_user = User(**validated_data)
-            
-            # Generate unique nickname if not provided
-            if not new_user.nickname:
-                new_nickname = generate_nickname()
-                while await cls.get_by_nickname(session, new_nickname):
-                    new_nickname = generate_nickname()
-                new_user.nickname = new_nickname
-                
-            new_user.verification_token = generate_verification_token()
-            session.add(new_user)
-            await session.commit()
-            await email_service.send_verification_email(new_user)
-            
-            return new_user
         except ValidationError as e:
             logger.error(f"Validation error during user creation: {e}")
             return None
 
+        validated_data['hashed_password'] = await hash_password_async(validated_data.pop('password'))
+        validated_data['verification_token'] = generate_verification_token()
+        generated_nickname = not validated_data.get('nickname')
+
+        new_user, conflict = None, None
+        for attempt in range(NICKNAME_INSERT_ATTEMPTS):
+            if generated_nickname:
+                validated_data['nickname'] = generate_nicknames(1)[0]
+            statement = (pg_insert(User).values(**validated_data)
+                         .on_conflict_do_nothing(index_elements=[User.email]).returning(User))
+            try:
+                result = await session.execute(statement)
+                new_user = result.scalars().first()
+                await session.commit()
+            except IntegrityError as e:
+                await session.rollback()
+                conflict = cls._conflicting_field(e)
+                # A concurrent registration may have claimed the generated nickname; draw another
+                if conflict == 'nickname' and generated_nickname and attempt < NICKNAME_INSERT_ATTEMPTS - 1:
+                    continue
+                logger.error(f"User creation failed on a unique constraint: {e.orig}")
+                break
+            conflict = None if new_user is not None else 'email'
+            break
+
+        if conflict is not None:
+            logger.error(f"User with given {conflict} already exists.")
+            if raise_conflicts:
+                raise UserConflictError(conflict)
+            return None
+        if new_user is None:
+            return None
+
+        await email_service.send_verification_email(new_user)
+        return new_user
+
+    @classmethod
+    async def _existing_values(cls, session: AsyncSession, column, values: Set[str]) -> Set[str]:
+        """Return which of values already exist in column, in a single query."""
+        if not values:
+            return set()
+        result = await cls._read(session, select(column).where(column.in_(values)))
+        return set(result.scalars().all()) if result else set()
+
+    @classmethod
+    async def _assign_nicknames(cls, session: AsyncSession, rows: List[Dict[str, Any]], taken: Set[str]) -> None:
+        """
+        Give every row without a nickname a generated one not in taken or the database.
+
+        Several candidates are drawn per row and checked with one IN query, so a round
+        trip is almost never wasted on a collision no matter how many users exist.
+        """
+        pending = [row for row in rows if not row.get('nickname')]
+        while pending:
+            candidates = generate_nicknames(len(pending) * NICKNAME_CANDIDATES_PER_ROW, exclude=taken)
+            existing = await cls._existing_values(session, User.nickname, set(candidates))
+            taken.update(existing)
+            available = (nickname for nickname in candidates if nickname not in existing)
+            for row, nickname in zip(pending, available):
+                row['nickname'] = nickname
+                taken.add(nickname)
+            pending = [row for row in pending if not row.get('nickname')]
+
+    @staticmethod
+    def _conflicting_field(error: IntegrityError) -> Optional[str]:
+        """The field (email or nickname) whose unique index an IntegrityError violated, if any."""
+        message = str(error.orig)
+        return next((field for index, field in USER_UNIQUE_INDEXES.items() if f'"{index}"' in message), None)
+
     @classmethod
-    async def update(cls, session: AsyncSession, user_id: UUID, update_data: Dict[str, str]) -> Optional[User]:
+    async def bulk_create(cls, session: AsyncSession, rows: List[Tuple[int, Dict[str, Any]]], email_service: EmailService) -> List[Dict[str, Any]]:
+        """
+        Create a batch of users with set-based checks and a single multi-row INSERT.
+
+        Rows are validated with the UserCreate rules; email and nickname uniqueness is
+        checked with one IN query each, passwords are hashed in parallel on the password
+        hash pool, and the insert uses ON CONFLICT DO NOTHING so concurrent creations
+        are reported as duplicates rather than failing the batch. Large batches are
+        inserted in as few statements as asyncpg's bind parameter limit allows. Verification emails are
+        queued for every created user.
+
+        :param session: The AsyncSession instance for database access.
+        :param rows: (row number, raw row data) pairs.
+        :param email_service: Service used to queue verification emails.
+        :return: One result dict per row, ordered by row number.
+        """
+        results = []
+        candidates = []
+        for row_number, data in rows:
+            try:
+                candidates.append((row_number, UserCreate(**data).model_dump()))
+            except ValidationError as e:
+                results.append({"row": row_number, "status": "invalid", "email": data.get('email'),
+                                "errors": [error['msg'] for error in e.errors()]})
+
+        taken_emails = await cls._existing_values(session, User.email, {data['email'] for _, data in candidates})
+        taken_nicknames = await cls._existing_values(session, User.nickname, {data['nickname'] for _, data in candidates if data.get('nickname')})
+
+        accepted = []
+        for row_number, data in candidates:
+            if data['email'] in taken_emails:
+                results.append({"row": row_number, "status": "duplicate", "email": data['email'], "errors": ["Email already exists"]})
+                continue
+            if data.get('nickname') and data['nickname'] in taken_nicknames:
+                results.append({"row": row_number, "status": "duplicate", "email": data['email'], "errors": ["Nickname already exists"]})
+                continue
+            taken_emails.add(data['email'])
+            if data.get('nickname'):
+                taken_nicknames.add(data['nickname'])
+            accepted.append((row_number, data))
+
+        if accepted:
+            generated = {row_number for row_number, data in accepted if not data.get('nickname')}
+            await cls._assign_nicknames(session, [data for _, data in accepted], taken_nicknames)
+
+            # Keep at most one job per worker queued so an import cannot fill the hash queue
+            slots = asyncio.Semaphore(settings.password_hash_workers)
+            async def hash_one(password: str) -> str:
+                async with slots:
+                    return await hash_password_async(password)
+            hashes = await asyncio.gather(*(hash_one(data.pop('password')) for _, data in accepted))
+
+            for (_, data), hashed_password in zip(accepted, hashes):
+                data.update(
+                    id=uuid4(),
+                    hashed_password=hashed_password,
+                    verification_token=generate_verification_token(),
+                    role=UserRole.ANONYMOUS,
+                    email_verified=False,
+                    is_locked=False,
+                    is_professional=False,
+                    failed_login_attempts=0,
+                )
+            inserted = set()
+            pending = accepted
+            rows_per_insert = MAX_BIND_PARAMETERS // len(User.__table__.columns)
+            for attempt in range(NICKNAME_INSERT_ATTEMPTS):
+                for start in range(0, len(pending), rows_per_insert):
+                    chunk = pending[start:start + rows_per_insert]
+                    query = pg_insert(User).values([data for _, data in chunk]).on_conflict_do_nothing().returning(User.id)
+                    result = await session.execute(query)
+                    inserted.update(result.scalars().all())
+                await session.commit()
+
+                # Rows skipped only because a concurrent insert took their generated nickname get another one
+                skipped = [(row_number, data) for row_number, data in pending if data['id'] not in inserted and row_number in generated]
+                taken_emails = await cls._existing_values(session, User.email, {data['email'] for _, data in skipped})
+                pending = [(row_number, data) for row_number, data in skipped if data['email'] not in taken_emails]
+                if not pending:
+                    break
+                for _, data in pending:
+                    data['nickname'] = None
+                await cls._assign_nicknames(session, [data for _, data in pending], set())
+
+            for row_number, data in accepted:
+                if data['id'] in inserted:
+                    results.append({"row": row_number, "status": "created", "email": data['email'], "id": data['id']})
+                    await email_service.send_verification_email(User(**data))
+                else:
+                    results.append({"row": row_number, "status": "duplicate", "email": data['email'], "errors": ["Email or nickname already exists"]})
+
+        results.sort(key=lambda result: result['row'])
+        return results
+
+    @classmethod
+    async def update(cls, session: AsyncSession, user_id: UUID, update_data: Dict[str, str],
+                     expected_updated_at: Optional[Sequence[datetime]] = None) -> Optional[User]:
+        """
+        Update a user with a single UPDATE ... RETURNING statement.
+
+        Returns None if the data is invalid or the user does not exist. Email and nickname
+        uniqueness is left to the unique indexes: a violation raises UserConflictError.
+
+        :param expected_updated_at: Only update if updated_at is one of these (an If-Match
+            precondition). It is part of the UPDATE's WHERE clause, so concurrent writers
+            holding the same version cannot both succeed. UserModifiedError is raised if the
+            user exists with another version.
+        """
         try:
-            # Get the user to update
-            user = await cls.get_by_id(session, user_id)
-            if not user:
-                logger.error(f"User with ID {user_id} not found.")
-                return None
-                
-            # Validate the update data using Pydantic
             validated_data = UserUpdate(**update_data).dict(exclude_unset=True)
-
-            # Check nickname uniqueness if it's being updated
-            if 'nickname' in validated_data and validated_data['nickname']:
-                existing_user = await cls.get_by_nickname(session, validated_data['nickname'])
-                if existing_user and existing_user.id != user_id:
-                    logger.error("Nickname already taken by another user.")
-                    return None
-
-            # Handle password updates if included
-            if 'password' in validated_data:
-                validated_data['hashed_password'] = hash_password(validated_data.pop('password'))
-                
-            # Check nickname uniqueness if it's being updated
-            if 'nickname' in validated_data and validated_data['nickname']:
-                existing_user = await cls.get_by_nickname(session, validated_data['nickname'])
-                if existing_user and existing_user.id != user_id:
-                    logger.error("Nickname already taken by another user.")
-                    return None
-                    
-            
-            # Update only the provided fields
-            for field, value in validated_data.items():
-                setattr(user, field, value)
-                
-            # Save changes
-            session.add(user)
-            await session.commit()
-            await session.refresh(user)
-            
-            logger.info(f"User {user_id} updated successfully.")
-            return user
         except ValidationError as e:
             logger.error(f"Validation error during user update: {e}")
-            await session.rollback()
             return None
-        except Exception as e:  # Broad exception handling for debugging
+
+        # Handle password updates if included
+        if 'password' in validated_data:
+            validated_data['hashed_password'] = await hash_password_async(validated_data.pop('password'))
+
+        statement = update(User).where(User.id == user_id)
+        if expected_updated_at is not None:
+            statement = statement.where(User.updated_at.in_(expected_updated_at))
+        statement = statement.values(**validated_data).returning(User).execution_options(populate_existing=True)
+        try:
+            result = await session.execute(statement)
+            user = result.scalars().first()
+            await session.commit()
+        except IntegrityError as e:
+            await session.rollback()
+            field = cls._conflicting_field(e)
+            if field is None:
+                logger.error(f"Error during user update: {e}")
+                return None
+            logger.error(f"User update failed: {field} already taken by another user.")
+            raise UserConflictError(field) from e
+        except SQLAlchemyError as e:
             logger.error(f"Error during user update: {e}")
             await session.rollback()
             return None
 
+        if user is None:
+            # Only a failed precondition costs a second query, to tell 412 from 404
+            if expected_updated_at is not None and await cls.get_by_id(session, user_id) is not None:
+                logger.info(f"User {user_id} not updated: modified since the expected version.")
+                raise UserModifiedError(f"User {user_id} has been modified")
+            logger.error(f"User with ID {user_id} not found.")
+            return None
+        principal_cache.invalidate(user_id)
+        logger.info(f"User {user_id} updated successfully.")
+        return user
+
+    @classmethod
+    async def _update_one(cls, session: AsyncSession, user_id: UUID, values: Dict[str, Any], *conditions) -> bool:
+        """UPDATE a single user matching conditions in one statement; True if a row changed."""
+        statement = update(User).where(User.id == user_id, *conditions).values(**values).returning(User.id)
+        result = await cls._execute_query(session, statement)
+        if result is None or result.scalar() is None:
+            return False
+        principal_cache.invalidate(user_id)
+        return True
+
     @classmethod
     async def delete(cls, session: AsyncSession, user_id: UUID) -> bool:
-        user = await cls.get_by_id(session, user_id)
-        if not user:
+        result = await cls._execute_query(session, delete(User).where(User.id == user_id).returning(User.id))
+        if result is None or result.scalar() is None:
             logger.info(f"User with ID {user_id} not found.")
             return False
-        await session.delete(user)
-        await session.commit()
+        principal_cache.invalidate(user_id)
         return True
 
+    @staticmethod
+    def _unique_ids(user_ids: Sequence[UUID]) -> List[UUID]:
+        return list(dict.fromkeys(user_ids))
+
+    @staticmethod
+    def _id_in(user_ids: Sequence[UUID]):
+        """id = ANY(:ids), binding the ids as one uuid[] parameter however many there are."""
+        return User.id == any_(bindparam("ids", list(user_ids), type_=ARRAY(User.id.type)))
+
+    @classmethod
+    async def get_many_by_ids(cls, session: AsyncSession, user_ids: Sequence[UUID]) -> Dict[UUID, User]:
+        """Load the given users in one query, keyed by id; unknown ids are absent."""
+        if not user_ids:
+            return {}
+        result = await session.execute(select(User).where(cls._id_in(cls._unique_ids(user_ids))))
+        return {user.id: user for user in result.scalars()}
+
+    @classmethod
+    async def _bulk_apply(cls, session: AsyncSession, statement, user_ids: Sequence[UUID], status: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Run a set-based UPDATE/DELETE ... WHERE id = ANY(:ids) RETURNING id and commit.
+
+        Returns one result per distinct requested id, in request order: `status` for the
+        rows the statement touched, not_found for the rest; None on a database error.
+        """
+        ids = cls._unique_ids(user_ids)
+        if not ids:
+            return []
+        statement = statement.where(cls._id_in(ids)).returning(User.id).execution_options(synchronize_session=False)
+        try:
+            result = await session.execute(statement)
+            affected = set(result.scalars())
+            await session.commit()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error during bulk {status}: {e}")
+            await session.rollback()
+            return None
+        for user_id in affected:
+            principal_cache.invalidate(user_id)
+        logger.info(f"Bulk {status}: {len(affected)} of {len(ids)} users.")
+        return [{"id": user_id, "status": status if user_id in affected else "not_found"} for user_id in ids]
+
+    @classmethod
+    async def bulk_set_role(cls, session: AsyncSession, user_ids: Sequence[UUID], role: UserRole) -> Optional[List[Dict[str, Any]]]:
+        return await cls._bulk_apply(session, update(User).values(role=role), user_ids, "updated")
+
     @classmethod
-    async def list_users(cls, session: AsyncSession, skip: int = 0, limit: int = 10) -> List[User]:
-        query = select(User).offset(skip).limit(limit)
-        result = await cls._execute_query(session, query)
+    async def bulk_lock(cls, session: AsyncSession, user_ids: Sequence[UUID]) -> Optional[List[Dict[str, Any]]]:
+        return await cls._bulk_apply(session, update(User).values(is_locked=True), user_ids, "updated")
+
+    @classmethod
+    async def bulk_unlock(cls, session: AsyncSession, user_ids: Sequence[UUID]) -> Optional[List[Dict[str, Any]]]:
+        statement = update(User).values(is_locked=False, failed_login_attempts=0)
+        return await cls._bulk_apply(session, statement, user_ids, "updated")
+
+    @classmethod
+    async def bulk_verify_email(cls, session: AsyncSession, user_ids: Sequence[UUID]) -> Optional[List[Dict[str, Any]]]:
+        """Mark emails verified as verify_email_with_token does, promoting only ANONYMOUS users to AUTHENTICATED."""
+        statement = update(User).values(
+            email_verified=True,
+            verification_token=None,
+            role=case((User.role == UserRole.ANONYMOUS, literal(UserRole.AUTHENTICATED, type_=User.role.type)), else_=User.role),
+        )
+        return await cls._bulk_apply(session, statement, user_ids, "updated")
+
+    @classmethod
+    async def bulk_delete(cls, session: AsyncSession, user_ids: Sequence[UUID]) -> Optional[List[Dict[str, Any]]]:
+        return await cls._bulk_apply(session, delete(User), user_ids, "deleted")
+
+    @classmethod
+    async def list_users(cls, session: AsyncSession, skip: int = 0, limit: int = 10, sort: str = "created_at", **filters) -> List[User]:
+        """
+        List users with offset pagination.
+
+        :param sort: A key of USER_SORT_FIELDS, prefixed with '-' for descending order.
+        :param filters: Keyword filters accepted by _user_filters.
+        :raises ValueError: If the sort field is not supported.
+        """
+        query = select(User).where(*cls._user_filters(**filters)).order_by(*cls._sort_order(sort)).offset(skip).limit(limit)
+        result = await cls._read(session, query, replica=True)
         return result.scalars().all() if result else []
 
     @classmethod
-    async def register_user(cls, session: AsyncSession, user_data: Dict[str, str], get_email_service) -> Optional[User]:
-        return await cls.create(session, user_data, get_email_service)
+    def _sort_order(cls, sort: str) -> List[Any]:
+        """ORDER BY clauses for a sort key; only indexed keys are accepted, to avoid sorting the whole table."""
+        descending = sort.startswith("-")
+        columns = USER_SORT_FIELDS.get(sort[1:] if descending else sort)
+        if columns is None:
+            raise ValueError(f"Unsupported sort field: {sort}")
+        return [column.desc() for column in columns] if descending else list(columns)
+
+    @classmethod
+    async def list_users_keyset(cls, session: AsyncSession, limit: int = 10, cursor: Optional[str] = None, **filters) -> Tuple[List[User], Optional[str], Optional[str]]:
+        """
+        List users ordered by (created_at, id) using keyset pagination.
+
+        Each page is an index range scan on ix_users_created_at_id, so its cost does not
+        depend on how deep the page is.
+
+        :param session: The AsyncSession instance for database access.
+        :param limit: Maximum number of users to return.
+        :param cursor: Opaque cursor from a previous page, or None for the first page.
+        :param filters: Keyword filters accepted by _user_filters.
+        :return: The users, the cursor for the next page and the cursor for the previous page.
+        :raises ValueError: If the cursor is malformed.
+        """
+        key = tuple_(User.created_at, User.id)
+        direction = "next"
+        query = select(User).where(*cls._user_filters(**filters))
+        if cursor:
+            created_at, user_id, direction = decode_cursor(cursor)
+            boundary = tuple_(created_at, user_id)
+            query = query.where(key > boundary if direction == "next" else key < boundary)
+        if direction == "next":
+            query = query.order_by(User.created_at, User.id)
+        else:
+            query = query.order_by(User.created_at.desc(), User.id.desc())
+
+        result = await cls._read(session, query.limit(limit + 1), replica=True)
+        rows = list(result.scalars().all()) if result else []
+        has_more = len(rows) > limit
+        users = rows[:limit]
+        if direction == "prev":
+            users.reverse()
+        if not users:
+            return users, None, None
+
+        first, last = users[0], users[-1]
+        if direction == "next":
+            next_cursor = encode_cursor(last.created_at, last.id, "next") if has_more else None
+            prev_cursor = encode_cursor(first.created_at, first.id, "prev") if cursor else None
+        else:
+            next_cursor = encode_cursor(last.created_at, last.id, "next")
+            prev_cursor = encode_cursor(first.created_at, first.id, "prev") if has_more else None
+        return users, next_cursor, prev_cursor
+
+    @staticmethod
+    def _like_pattern(term: str, prefix_only: bool = False) -> str:
+        """ILIKE pattern (escape character "/") matching term literally, as a substring or a prefix."""
+        escaped = term.replace("/", "//").replace("%", "/%").replace("_", "/_")
+        return f"{escaped}%" if prefix_only else f"%{escaped}%"
+
+    @classmethod
+    async def search(cls, session: AsyncSession, q: str, limit: int = 10, cursor: Optional[str] = None) -> Tuple[List[User], Optional[str]]:
+        """
+        Search users by nickname, email, first name, last name and bio, best matches first.
+
+        A user matches when the full-text document (ix_users_search_document) matches q,
+        or when nickname, email or a name contains q (trigram indexes). Results are ranked
+        by ts_rank plus boosts for exact and prefix matches on nickname and email, and
+        paginated on (rank, id) so later pages cost the same as the first.
+
+        :param session: The AsyncSession instance for database access.
+        :param q: The search text.
+        :param limit: Maximum number of users to return.
+        :param cursor: Opaque cursor from a previous page, or None for the first page.
+        :return: The users and the cursor for the next page.
+        :raises ValueError: If the cursor is malformed.
+        """
+        term = q.strip()
+        if not term:
+            return [], None
+
+        document = literal_column(USER_SEARCH_DOCUMENT)
+        tsquery = func.websearch_to_tsquery(literal_column("'simple'::regconfig"), term)
+        substring, prefix = cls._like_pattern(term), cls._like_pattern(term, prefix_only=True)
+        rank = cast(
+            func.ts_rank(document, tsquery)
+            + case((func.lower(User.nickname) == term.lower(), 1.0), (User.nickname.ilike(prefix, escape="/"), 0.5), else_=0.0)
+            + case((func.lower(User.email) == term.lower(), 1.0), (User.email.ilike(prefix, escape="/"), 0.5), else_=0.0),
+            Float,
+        )
+        ranked = rank.label("rank")
+        query = select(User, ranked).where(or_(
+            document.op("@@")(tsquery),
+            User.nickname.ilike(substring, escape="/"),
+            User.email.ilike(substring, escape="/"),
+            User.first_name.ilike(substring, escape="/"),
+            User.last_name.ilike(substring, escape="/"),
+        ))
+        if cursor:
+            after_rank, after_id = decode_rank_cursor(cursor)
+            query = query.where(tuple_(rank, User.id) < tuple_(after_rank, after_id))
+        query = query.order_by(ranked.desc(), User.id.desc()).limit(limit + 1)
+
+        result = await cls._read(session, query, replica=True)
+        rows = list(result.all()) if result else []
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_rank_cursor(rows[-1].rank, rows[-1].User.id)
+        return [row.User for row in rows], next_cursor
+
+    @classmethod
+    def _user_filters(cls, role: Optional[UserRole] = None, is_locked: Optional[bool] = None,
+                      email_verified: Optional[bool] = None, is_professional: Optional[bool] = None,
+                      created_after: Optional[datetime] = None, created_before: Optional[datetime] = None,
+                      last_login_after: Optional[datetime] = None, last_login_before: Optional[datetime] = None) -> List[Any]:
+        """
+        Build WHERE conditions for the given user filters; None means no filter.
+
+        Boolean flags are rendered as bare (or negated) columns rather than bound
+        parameters, so they match the predicates of the partial indexes on users.
+        """
+        conditions = []
+        if role is not None:
+            conditions.append(User.role == role)
+        for column, value in ((User.is_locked, is_locked), (User.email_verified, email_verified), (User.is_professional, is_professional)):
+            if value is not None:
+                conditions.append(column if value else not_(column))
+        if created_after is not None:
+            conditions.append(User.created_at >= created_after)
+        if created_before is not None:
+            conditions.append(User.created_at < created_before)
+        if last_login_after is not None:
+            conditions.append(User.last_login_at >= last_login_after)
+        if last_login_before is not None:
+            conditions.append(User.last_login_at < last_login_before)
+        return conditions
+
+    @classmethod
+    async def stream_users(cls, session: AsyncSession, fields: Sequence[str], **filters) -> AsyncIterator[Sequence[Any]]:
+        """
+        Stream user rows through a server-side cursor.
+
+        Only the requested columns are selected and rows are fetched user_export_batch_size
+        at a time, so memory use stays flat regardless of table size.
+
+        :param session: The AsyncSession instance for database access.
+        :param fields: Column names from EXPORTABLE_USER_FIELDS.
+        :param filters: Keyword filters accepted by _user_filters.
+        :raises ValueError: If a field is not exportable.
+        """
+        unknown = [field for field in fields if field not in EXPORTABLE_USER_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown export fields: {', '.join(unknown)}")
+        query = (
+            select(*(getattr(User, field) for field in fields))
+            .where(*cls._user_filters(**filters))
+            .order_by(User.created_at, User.id)
+            .execution_options(yield_per=settings.user_export_batch_size)
+        )
+        result = await session.stream(query, bind_arguments=REPLICA_STREAM)
+        async for row in result:
+            yield row
+
+    @classmethod
+    async def register_user(cls, session: AsyncSession, user_data: Dict[str, str], get_email_service, raise_conflicts: bool = False) -> Optional[User]:
+        return await cls.create(session, user_data, get_email_service, raise_conflicts)
     
 
+    @classmethod
+    async def authenticate(cls, session: AsyncSession, email: str, password: str) -> Tuple[Optional[User], bool]:
+        """
+        Check a user's credentials in two statements.
+
+        The credential columns are read once. Locked and unverified accounts are rejected
+        without running bcrypt. The outcome is then applied with a single
+        UPDATE ... RETURNING, so concurrent failed attempts are serialized by the row lock
+        and cannot race past max_login_attempts.
+
+        :param session: The AsyncSession instance for database access.
+        :param email: The email the user logs in with.
+        :param password: The plain text password to check.
+        :return: The logged-in user (or None) and whether the account is locked.
+        """
+        query = select(User.id, User.hashed_password, User.is_locked, User.email_verified).where(User.email == email)
+        result = await session.execute(query)
+        credentials = result.first()
+        if credentials is None:
+            return None, False
+        if credentials.is_locked:
+            return None, True
+        if not credentials.email_verified:
+            return None, False
+
+        if await verify_password_async(password, credentials.hashed_password):
+            query = (
+                update(User)
+                .where(User.id == credentials.id, User.is_locked.isnot(True))
+                .values(failed_login_attempts=0, last_login_at=datetime.now(timezone.utc))
+                .returning(User)
+                .execution_options(populate_existing=True)
+            )
+            result = await session.execute(query)
+            user = result.scalars().first()
+            await session.commit()
+            # No row means another request locked the account since it was read
+            return user, user is None
+
+        attempts = func.coalesce(User.failed_login_attempts, 0) + 1
+        query = (
+            update(User)
+            .where(User.id == credentials.id)
+            .values(
+                failed_login_attempts=attempts,
+                is_locked=or_(User.is_locked.is_(True), attempts >= settings.max_login_attempts),
+            )
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        result = await session.execute(query)
+        # populate_existing refreshes a User already in the session, so later reads see the new lock state
+        user = result.scalars().first()
+        locked = bool(user is not None and user.is_locked)
+        await session.commit()
+        if locked:
+            principal_cache.invalidate(credentials.id)
+        return None, locked
+
     @classmethod
     async def login_user(cls, session: AsyncSession, email: str, password: str) -> Optional[User]:
-        user = await cls.get_by_email(session, email)
-        if user:
-            if user.email_verified is False:
-                return None
-            if user.is_locked:
-                return None
-            if verify_password(password, user.hashed_password):
-                user.failed_login_attempts = 0
-                user.last_login_at = datetime.now(timezone.utc)
-                session.add(user)
-                await session.commit()
-                return user
-            else:
-                user.failed_login_attempts += 1
-                if user.failed_login_attempts >= settings.max_login_attempts:
-                    user.is_locked = True
-                session.add(user)
-                await session.commit()
-        return None
+        user, _ = await cls.authenticate(session, email, password)
+        return user
 
     @classmethod
     async def is_account_locked(cls, session: AsyncSession, email: str) -> bool:
@@ -189,49 +700,80 @@ class UserService:
 
     @classmethod
     async def reset_password(cls, session: AsyncSession, user_id: UUID, new_password: str) -> bool:
-        hashed_password = hash_password(new_password)
-        user = await cls.get_by_id(session, user_id)
-        if user:
-            user.hashed_password = hashed_password
-            user.failed_login_attempts = 0  # Resetting failed login attempts
-            user.is_locked = False  # Unlocking the user account, if locked
-            session.add(user)
-            await session.commit()
-            return True
-        return False
+        hashed_password = await hash_password_async(new_password)
+        # Resetting the password also clears failed attempts and unlocks the account
+        return await cls._update_one(session, user_id, {
+            "hashed_password": hashed_password, "failed_login_attempts": 0, "is_locked": False,
+        })
 
     @classmethod
     async def verify_email_with_token(cls, session: AsyncSession, user_id: UUID, token: str) -> bool:
-        user = await cls.get_by_id(session, user_id)
-        if user and user.verification_token == token:
-            user.email_verified = True
-            user.verification_token = None  # Clear the token once used
-            user.role = UserRole.AUTHENTICATED
-            session.add(user)
-            await session.commit()
-            return True
-        return False
+        # The token is cleared once used
+        return await cls._update_one(session, user_id, {
+            "email_verified": True, "verification_token": None, "role": UserRole.AUTHENTICATED,
+        }, User.verification_token == token)
 
     @classmethod
-    async def count(cls, session: AsyncSession) -> int:
+    async def count(cls, session: AsyncSession, strategy: Optional[str] = None, **filters) -> int:
         """
         Count the number of users in the database.
 
+        Strategies:
+        - exact: SELECT count(*), a full scan of the table.
+        - estimated: the planner's row estimate from pg_class.reltuples, refreshed by
+          ANALYZE/autovacuum. Falls back to exact if the table has never been analyzed.
+        - counter: the trigger-maintained row in table_row_counts. Falls back to exact
+          if the counter table has not been migrated.
+
         :param session: The AsyncSession instance for database access.
+        :param strategy: One of the strategies above; defaults to settings.user_count_strategy.
+        :param filters: Keyword filters accepted by _user_filters. Estimates and counters
+            only cover the whole table, so filtered counts are always exact.
         :return: The count of users.
         """
-        query = select(func.count()).select_from(User)
-        result = await session.execute(query)
-        count = result.scalar()
+        conditions = cls._user_filters(**filters)
+        if conditions:
+            return await cls._exact_count(session, conditions)
+        strategy = strategy or settings.user_count_strategy
+        count = None
+        if strategy == "estimated":
+            count = await cls._estimated_count(session)
+        elif strategy == "counter":
+            count = await cls._counter_count(session)
+        elif strategy != "exact":
+            raise ValueError(f"Unknown count strategy: {strategy}")
+        if count is None:
+            count = await cls._exact_count(session)
         return count
+
+    @classmethod
+    async def _exact_count(cls, session: AsyncSession, conditions: Sequence[Any] = ()) -> int:
+        query = select(func.count()).select_from(User).where(*conditions)
+        result = await session.execute(query, bind_arguments=REPLICA_READ)
+        return result.scalar()
+
+    @classmethod
+    async def _estimated_count(cls, session: AsyncSession) -> Optional[int]:
+        query = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)")
+        result = await session.execute(query, {"table_name": User.__tablename__}, bind_arguments=REPLICA_READ)
+        estimate = result.scalar()
+        # reltuples is -1 (or 0 on older servers) until the table is first analyzed
+        return estimate if estimate and estimate > 0 else None
+
+    @classmethod
+    async def _counter_count(cls, session: AsyncSession) -> Optional[int]:
+        if cls._row_counter_migrated is None:
+            # Checked once per process, so counting needs no SAVEPOINT to survive a missing table
+            result = await session.execute(text("SELECT to_regclass('table_row_counts') IS NOT NULL"), bind_arguments=REPLICA_READ)
+            cls._row_counter_migrated = result.scalar()
+            if not cls._row_counter_migrated:
+                logger.warning("Row counter table not migrated, falling back to exact counts")
+        if not cls._row_counter_migrated:
+            return None
+        query = text("SELECT row_count FROM table_row_counts WHERE table_name = :table_name")
+        result = await session.execute(query, {"table_name": User.__tablename__}, bind_arguments=REPLICA_READ)
+        return result.scalar()
     
     @classmethod
     async def unlock_user_account(cls, session: AsyncSession, user_id: UUID) -> bool:
-        user = await cls.get_by_id(session, user_id)
-        if user and user.is_locked:
-            user.is_locked = False
-            user.failed_login_attempts = 0  # Optionally reset failed login attempts
-            session.add(user)
-            await session.commit()
-            return True
-        return False
\ No newline at end of file
+        return await cls._update_one(session, user_id, {"is_locked": False, "failed_login_attempts": 0}, User.is_locked)
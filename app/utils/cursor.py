@@ -0,0 +1,65 @@
+from builtins import Exception, ValueError, float, len, str
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+CURSOR_DIRECTIONS = ("next", "prev")
+
+def encode_cursor(created_at: datetime, user_id: UUID, direction: str = "next") -> str:
+    """
+    Encode a keyset position as an opaque, URL-safe cursor.
+
+    Args:
+        created_at: created_at of the boundary row.
+        user_id: id of the boundary row, used as a tie-breaker.
+        direction: 'next' to page forward from the row, 'prev' to page backward.
+    Returns:
+        str: The opaque cursor.
+    """
+    payload = json.dumps([created_at.isoformat(), str(user_id), direction], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID, str]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, user_id, direction = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if direction not in CURSOR_DIRECTIONS:
+            raise ValueError(f"Unknown cursor direction: {direction}")
+        return datetime.fromisoformat(created_at), UUID(user_id), direction
+    except Exception as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+def encode_rank_cursor(rank: float, user_id: UUID) -> str:
+    """
+    Encode a position in a ranked result list (ordered by rank, then id, descending).
+
+    Args:
+        rank: rank of the boundary row.
+        user_id: id of the boundary row, used as a tie-breaker.
+    Returns:
+        str: The opaque cursor.
+    """
+    payload = json.dumps([rank, str(user_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, UUID]:
+    """
+    Decode a cursor produced by encode_rank_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, user_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return float(rank), UUID(user_id)
+    except Exception as e:
+        raise ValueError("Invalid pagination cursor") from e
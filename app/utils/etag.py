@@ -0,0 +1,74 @@
+from builtins import OverflowError, ValueError, any, int, len, max, str
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, List, Optional, Sequence
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def _micros(moment: Optional[datetime]) -> int:
+    if moment is None:
+        return 0
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+def user_etag(updated_at: Optional[datetime], links: bool = True) -> str:
+    """
+    Strong ETag for a single user representation.
+
+    It changes whenever updated_at does; responses without links are a different
+    representation and get their own tag.
+    """
+    return f'"{_micros(updated_at):x}{"" if links else "-n"}"'
+
+def page_etag(representation: str, users: Iterable[Any], total: Optional[int], *state: Any) -> str:
+    """
+    Strong ETag for a page of users.
+
+    Derived from the page's ids and their latest updated_at, the item count and total,
+    the representation (query string and link base) and any other page state (e.g.
+    whether a next page exists), so any change to a listed user, or rows entering or
+    leaving the page, changes the tag.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(representation.encode("utf-8"))
+    latest, count = 0, 0
+    for user in users:
+        digest.update(user.id.bytes)
+        latest = max(latest, _micros(user.updated_at))
+        count += 1
+    digest.update(f"|{latest}|{count}|{total}|{state}".encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+def _tags(header: str) -> Sequence[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    """True if If-None-Match matches etag (weak comparison), i.e. a 304 can be sent."""
+    if not header:
+        return False
+    weak = etag[2:] if etag.startswith("W/") else etag
+    return any(tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == weak for tag in _tags(header))
+
+def if_match_versions(header: Optional[str]) -> Optional[List[datetime]]:
+    """
+    The updated_at values named by an If-Match header of user ETags, for a conditional UPDATE.
+
+    None means no precondition (no header, or '*'). Weak and unrecognised tags match no
+    version (If-Match uses strong comparison), so they can only produce a 412.
+    """
+    if header is None:
+        return None
+    versions = []
+    for tag in _tags(header):
+        if tag == "*":
+            return None
+        if tag.startswith("W/") or len(tag) < 2 or not (tag.startswith('"') and tag.endswith('"')):
+            continue
+        value = tag[1:-1]
+        value = value[:-2] if value.endswith("-n") else value
+        try:
+            versions.append(EPOCH + timedelta(microseconds=int(value, 16)))
+        except (ValueError, OverflowError):
+            continue
+    return versions
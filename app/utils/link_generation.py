@@ -1,48 +1,128 @@
-from builtins import dict, int, max, str
-from typing import List, Callable
-from urllib.parse import urlencode
+from builtins import dict, hasattr, int, max, str
+from typing import Any, Dict, List, Callable, Optional, Tuple
+from urllib.parse import urlencode, urlsplit, urlunsplit
 from uuid import UUID
 
 from fastapi import Request
 from app.schemas.link_schema import Link
 from app.schemas.pagination_schema import PaginationLink
+from settings.config import settings
+
+# (rel, route name, action) of the links attached to every user
+USER_LINK_ACTIONS = (
+    ("self", "get_user", "view"),
+    ("update", "update_user", "update"),
+    ("delete", "delete_user", "delete"),
+)
+
+class LinkTemplates:
+    """
+    Route paths for HATEOAS links, compiled once into format strings.
+
+    Building a link is then plain string formatting: no url_for route lookup and no
+    Link/HttpUrl validation per link.
+    """
+
+    def __init__(self):
+        self.user_templates: List[Tuple[str, str, str]] = []
+
+    def compile(self, app) -> None:
+        paths = {route.name: route.path_format for route in app.routes if hasattr(route, "path_format")}
+        self.user_templates = [(rel, paths[name], action) for rel, name, action in USER_LINK_ACTIONS]
+
+    def ensure_compiled(self, app) -> None:
+        """Compile from app unless already done at startup."""
+        if not self.user_templates:
+            self.compile(app)
+
+link_templates = LinkTemplates()
+
+def link_base_url(request: Request) -> str:
+    """Scheme, host and root path that links start with: server_base_url if configured, else the request's."""
+    if settings.links_use_server_base_url:
+        return str(settings.server_base_url).rstrip("/")
+    url = request.url
+    return f"{url.scheme}://{url.netloc}{request.scope.get('root_path', '')}"
 
 # Utility function to create a link
 def create_link(rel: str, href: str, method: str = "GET", action: str = None) -> Link:
     return Link(rel=rel, href=href, method=method, action=action)
 
 def create_pagination_link(rel: str, base_url: str, params: dict) -> PaginationLink:
-    # Ensure parameters are added in a specific order
+    # Ensure parameters are added in a specific order; any others (e.g. filters) follow
     query_string = f"skip={params['skip']}&limit={params['limit']}"
+    extra = {key: value for key, value in params.items() if key not in ('skip', 'limit')}
+    if extra:
+        query_string += f"&{urlencode(extra)}"
     return PaginationLink(rel=rel, href=f"{base_url}?{query_string}")
 
-def create_user_links(user_id: UUID, request: Request) -> List[Link]:
+def _base_url(request: Request) -> str:
+    """Return the request URL without its query string."""
+    if settings.links_use_server_base_url:
+        return link_base_url(request) + request.url.path
+    return urlunsplit(urlsplit(str(request.url))._replace(query=""))
+
+def create_user_links(user_id: UUID, request: Request, base_url: Optional[str] = None) -> List[Dict[str, str]]:
     """
     Generate navigation links for user actions.
+
+    Pass base_url (from link_base_url) when building links for many users in one request.
     """
-    actions = [
-        ("self", "get_user", "GET", "view"),
-        ("update", "update_user", "PUT", "update"),
-        ("delete", "delete_user", "DELETE", "delete")
-    ]
+    link_templates.ensure_compiled(request.app)
+    base_url = base_url if base_url is not None else link_base_url(request)
     return [
-        create_link(rel, str(request.url_for(action, user_id=str(user_id))), method, action_desc)
-        for rel, action, method, action_desc in actions
+        {"rel": rel, "href": base_url + path.format(user_id=user_id), "action": action, "type": "application/json"}
+        for rel, path, action in link_templates.user_templates
     ]
 
-def generate_pagination_links(request: Request, skip: int, limit: int, total_items: int) -> List[PaginationLink]:
-    base_url = str(request.url)
-    total_pages = (total_items + limit - 1) // limit
+def _pagination_link(rel: str, href: str) -> Dict[str, str]:
+    return {"rel": rel, "href": href, "method": "GET"}
+
+def _extra_query(params: Optional[dict]) -> str:
+    return f"&{urlencode(params)}" if params else ""
+
+def generate_pagination_links(request: Request, skip: int, limit: int, total_items: Optional[int], has_more: Optional[bool] = None, params: Optional[dict] = None) -> List[Dict[str, str]]:
+    """
+    Build offset pagination links.
+
+    When total_items is None (counting skipped) the 'last' link is omitted and 'next'
+    is decided by has_more; otherwise has_more, if given, still takes precedence over
+    the total for 'next', since an estimated total may be off. params (e.g. filters
+    and sort) are repeated on every link.
+    """
+    # One template per request; each link only substitutes skip
+    template = f"{_base_url(request)}?skip={{skip}}&limit={limit}{_extra_query(params)}"
     links = [
-        create_pagination_link("self", base_url, {'skip': skip, 'limit': limit}),
-        create_pagination_link("first", base_url, {'skip': 0, 'limit': limit}),
-        create_pagination_link("last", base_url, {'skip': max(0, (total_pages - 1) * limit), 'limit': limit})
+        _pagination_link("self", template.format(skip=skip)),
+        _pagination_link("first", template.format(skip=0)),
     ]
 
-    if skip + limit < total_items:
-        links.append(create_pagination_link("next", base_url, {'skip': skip + limit, 'limit': limit}))
+    if total_items is not None:
+        total_pages = (total_items + limit - 1) // limit
+        links.append(_pagination_link("last", template.format(skip=max(0, (total_pages - 1) * limit))))
+
+    if has_more is None:
+        has_more = total_items is not None and skip + limit < total_items
+    if has_more:
+        links.append(_pagination_link("next", template.format(skip=skip + limit)))
 
     if skip > 0:
-        links.append(create_pagination_link("prev", base_url, {'skip': max(skip - limit, 0), 'limit': limit}))
+        links.append(_pagination_link("prev", template.format(skip=max(skip - limit, 0))))
+
+    return links
+
+def generate_cursor_pagination_links(request: Request, limit: int, cursor: Optional[str], next_cursor: Optional[str], prev_cursor: Optional[str], params: Optional[dict] = None) -> List[Dict[str, str]]:
+    # Cursors are URL-safe base64, so they are substituted without escaping
+    template = f"{_base_url(request)}?cursor={{cursor}}&limit={limit}{_extra_query(params)}"
+    links = [
+        _pagination_link("self", template.format(cursor=cursor or "")),
+        _pagination_link("first", template.format(cursor="")),
+    ]
+
+    if next_cursor:
+        links.append(_pagination_link("next", template.format(cursor=next_cursor)))
+
+    if prev_cursor:
+        links.append(_pagination_link("prev", template.format(cursor=prev_cursor)))
 
     return links
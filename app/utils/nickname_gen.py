@@ -1,10 +1,46 @@
-from builtins import str
+from builtins import len, list, set, str
 import random
+from typing import Iterable, List
+
+ADJECTIVES = (
+    "agile", "amber", "ancient", "bold", "brave", "breezy", "bright", "calm",
+    "cheery", "clever", "cosmic", "crimson", "curious", "daring", "dapper", "eager",
+    "electric", "fancy", "fearless", "fierce", "fluffy", "frosty", "gentle", "giddy",
+    "glowing", "golden", "grand", "happy", "hardy", "hidden", "humble", "icy",
+    "jolly", "keen", "kind", "lively", "lucky", "lunar", "mellow", "merry",
+    "mighty", "misty", "nimble", "noble", "plucky", "polar", "proud", "quick",
+    "quiet", "rapid", "rustic", "silent", "silver", "sleepy", "sly", "snowy",
+    "solar", "spry", "stellar", "sunny", "swift", "tidy", "vivid", "witty",
+)
+
+ANIMALS = (
+    "alpaca", "badger", "beaver", "bison", "bobcat", "camel", "cheetah", "cobra",
+    "condor", "cougar", "coyote", "crane", "dingo", "dolphin", "eagle", "egret",
+    "falcon", "ferret", "finch", "fox", "gazelle", "gecko", "gopher", "heron",
+    "hippo", "ibis", "iguana", "impala", "jackal", "jaguar", "koala", "lemur",
+    "leopard", "lion", "llama", "lynx", "marmot", "meerkat", "mink", "moose",
+    "narwhal", "ocelot", "orca", "osprey", "otter", "owl", "panda", "panther",
+    "parrot", "pelican", "puffin", "quokka", "raccoon", "raven", "salmon", "seal",
+    "sparrow", "stork", "tapir", "tiger", "toucan", "walrus", "wombat", "yak",
+)
+
+NUMBER_RANGE = 10000
 
 
 def generate_nickname() -> str:
     """Generate a URL-safe nickname using adjectives and animal names."""
-    adjectives = ["clever", "jolly", "brave", "sly", "gentle"]
-    animals = ["panda", "fox", "raccoon", "koala", "lion"]
-    number = random.randint(0, 999)
-    return f"{random.choice(adjectives)}_{random.choice(animals)}_{number}"
+    number = random.randrange(NUMBER_RANGE)
+    return f"{random.choice(ADJECTIVES)}_{random.choice(ANIMALS)}_{number}"
+
+
+def generate_nicknames(count: int, exclude: Iterable[str] = ()) -> List[str]:
+    """Generate count distinct nicknames, none of them in exclude."""
+    excluded = set(exclude)
+    nicknames: List[str] = []
+    seen = set()
+    while len(nicknames) < count:
+        nickname = generate_nickname()
+        if nickname not in excluded and nickname not in seen:
+            seen.add(nickname)
+            nicknames.append(nickname)
+    return nicknames
@@ -0,0 +1,82 @@
+from builtins import bool, int, len, str
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+from app.models.user_model import User, UserRole
+from settings.config import settings
+
+@dataclass(frozen=True)
+class Principal:
+    """The slice of a user that authentication and authorization checks need."""
+    id: UUID
+    role: UserRole
+    email_verified: bool
+    is_locked: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, role=user.role, email_verified=user.email_verified, is_locked=user.is_locked)
+
+class PrincipalCache:
+    """
+    In-process LRU cache of principals keyed by user id, with a TTL.
+
+    UserService invalidates entries whenever it changes a field a principal carries;
+    the TTL bounds staleness for changes made by other worker processes.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Principal]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id) -> Optional[Principal]:
+        key = str(user_id)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, principal: Principal) -> None:
+        if self.max_size <= 0:
+            return
+        key = str(principal.id)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, principal)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id) -> None:
+        if self._entries.pop(str(user_id), None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of size and hit/miss counters."""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+principal_cache = PrincipalCache(
+    max_size=settings.principal_cache_max_size,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+)
@@ -0,0 +1,123 @@
+from builtins import dict, float, getattr, int, isinstance, len, list, str, tuple
+import contextvars
+import logging
+import re
+import time
+from collections import Counter
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_current: "contextvars.ContextVar[Optional[QueryStats]]" = contextvars.ContextVar("query_stats", default=None)
+
+# Bind placeholders of the asyncpg, psycopg and sqlite paramstyles
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|%s|\?")
+# An IN list expanded to one placeholder per value
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(statement: str) -> str:
+    """The statement with placeholders, expanded IN lists and whitespace normalized, so repeats of one query compare equal."""
+    shape = _IN_LIST.sub("(?)", _PLACEHOLDER.sub("?", statement))
+    return _WHITESPACE.sub(" ", shape).strip()
+
+def redact_parameters(parameters: Any) -> str:
+    """Describe statement parameters without their values, which may be emails, password hashes or tokens."""
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{name}=?" for name in parameters) + "}"
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            return f"[{len(parameters)} parameter sets]"
+        return "(" + ", ".join("?" for _ in parameters) + ")"
+    return "?"
+
+class QueryStats:
+    """Statements executed while handling one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least threshold times, most frequent first."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_seconds * 1000:.1f};desc="{self.count} queries"'
+
+def current_query_stats() -> Optional[QueryStats]:
+    """The stats of the request being handled, or None outside QueryStatsMiddleware."""
+    return _current.get()
+
+def instrument_query_stats(engine, slow_query_seconds: float) -> None:
+    """
+    Count and time every statement an (async) engine executes against the current request.
+
+    Statements taking slow_query_seconds or longer are logged with their parameter values redacted.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_stats_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_stats_started"].pop()
+        stats = _current.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+        if elapsed >= slow_query_seconds:
+            logger.warning(f"Slow query ({elapsed * 1000:.1f} ms): {_WHITESPACE.sub(' ', statement)} parameters={redact_parameters(parameters)}")
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(context):
+        # after_cursor_execute does not fire for failed statements
+        started = context.connection.info.get("query_stats_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware collecting the statements each request executes.
+
+    Statement shapes repeated n_plus_one_threshold times or more in one request are
+    logged as a likely N+1. With expose_headers, the count and DB time are added to the
+    response as X-DB-Queries and Server-Timing; statements run after the response has
+    started (e.g. while streaming) are not in the headers.
+    """
+
+    def __init__(self, app, n_plus_one_threshold: int = 10, expose_headers: bool = False):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_wrapper(message):
+            if self.expose_headers and message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.count).encode("ascii")))
+                headers.append((b"server-timing", stats.server_timing().encode("ascii")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            for shape, count in stats.repeated(self.n_plus_one_threshold):
+                logger.warning(f"Possible N+1 in {scope['method']} {scope['path']}: {count} executions of {shape}")
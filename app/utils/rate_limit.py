@@ -0,0 +1,207 @@
+from builtins import ValueError, bool, dict, float, int, isinstance, len, max, min, next, set, sorted, staticmethod, str
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A token bucket allowing `capacity` requests in a burst, refilled at capacity/period per second."""
+    capacity: int
+    period_seconds: float
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimit":
+        """Parse '<requests>/<seconds>', e.g. '5/60' for five requests a minute."""
+        try:
+            capacity, period = spec.split("/")
+            limit = cls(int(capacity), float(period))
+        except ValueError as e:
+            raise ValueError(f"Invalid rate limit {spec!r}; expected '<requests>/<seconds>'") from e
+        if limit.capacity <= 0 or limit.period_seconds <= 0:
+            raise ValueError(f"Invalid rate limit {spec!r}; both parts must be positive")
+        return limit
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period_seconds
+
+class RateLimitBackend(ABC):
+    """
+    Storage for token buckets.
+
+    The in-memory backend limits each worker process separately; implement hit() over a
+    shared store (e.g. a Redis script doing the same arithmetic) to enforce limits
+    across processes and hosts.
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        """Take one token from key's bucket; return (allowed, seconds until a token is available)."""
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Per-process token buckets, least recently used buckets evicted beyond max_keys."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self.allowed = 0
+        self.rejected = 0
+
+    async def hit(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (float(limit.capacity), now))
+        tokens = min(float(limit.capacity), tokens + (now - updated) * limit.refill_per_second)
+        allowed = tokens >= 1.0
+        if allowed:
+            tokens -= 1.0
+            self.allowed += 1
+        else:
+            self.rejected += 1
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1.0 - tokens) / limit.refill_per_second
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"keys": len(self._buckets), "allowed": self.allowed, "rejected": self.rejected}
+
+def parse_route_limits(config: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, RateLimit]]:
+    """Turn {path: {'ip': '20/60', 'email': '5/60'}} from Settings into RateLimit objects."""
+    limits = {}
+    for path, keyed in config.items():
+        unknown = set(keyed) - {"ip", "email"}
+        if unknown:
+            raise ValueError(f"Unknown rate limit keys for {path}: {', '.join(sorted(unknown))}")
+        limits[path] = {key: RateLimit.parse(spec) for key, spec in keyed.items()}
+    return limits
+
+def client_ip(scope, trusted_proxies: int) -> str:
+    """
+    The client address, honouring X-Forwarded-For from trusted_proxies reverse proxies.
+
+    Each proxy appends the address it received the request from, so the client is the
+    entry trusted_proxies positions from the end; anything further left is client-supplied.
+    """
+    if trusted_proxies > 0:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                hops = [hop.strip() for hop in value.decode("latin-1").split(",") if hop.strip()]
+                if hops:
+                    return hops[max(len(hops) - trusted_proxies, 0)]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+def body_email(body: bytes, content_type: str) -> Optional[str]:
+    """The target email of a login form ('username') or JSON registration ('email') body."""
+    try:
+        if content_type.startswith("application/json"):
+            data = json.loads(body)
+            value = data.get("email") if isinstance(data, dict) else None
+        elif content_type.startswith("application/x-www-form-urlencoded"):
+            form = parse_qs(body.decode("utf-8"))
+            value = (form.get("username") or form.get("email") or [None])[0]
+        else:
+            return None
+    except ValueError:
+        return None
+    return value.strip().lower() if isinstance(value, str) and value.strip() else None
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware rate limiting POSTs to configured paths, by client IP and by target email.
+
+    The IP check runs before the body is read and the email check before the request
+    reaches the app, so a rejected attempt costs no DB query and no bcrypt work.
+    """
+
+    # Bodies larger than this are not parsed for an email (login and registration bodies are tiny)
+    MAX_BODY_BYTES = 64 * 1024
+
+    def __init__(self, app, limits: Dict[str, Dict[str, RateLimit]], backend: RateLimitBackend, trusted_proxies: int = 1):
+        self.app = app
+        self.limits = limits
+        self.backend = backend
+        self.trusted_proxies = trusted_proxies
+
+    async def __call__(self, scope, receive, send):
+        route_limits = self.limits.get(scope["path"]) if scope["type"] == "http" and scope["method"] == "POST" else None
+        if not route_limits:
+            await self.app(scope, receive, send)
+            return
+
+        ip_limit = route_limits.get("ip")
+        if ip_limit is not None:
+            allowed, retry_after = await self.backend.hit(f"ip:{scope['path']}:{client_ip(scope, self.trusted_proxies)}", ip_limit)
+            if not allowed:
+                await self._reject(send, retry_after)
+                return
+
+        email_limit = route_limits.get("email")
+        if email_limit is not None:
+            body, receive = await self._buffer_body(receive, self.MAX_BODY_BYTES)
+            content_type = next((value.decode("latin-1") for name, value in scope.get("headers", []) if name == b"content-type"), "")
+            email = body_email(body, content_type) if body is not None else None
+            if email is not None:
+                allowed, retry_after = await self.backend.hit(f"email:{scope['path']}:{email}", email_limit)
+                if not allowed:
+                    await self._reject(send, retry_after)
+                    return
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _buffer_body(receive, max_bytes: int):
+        """
+        Read the request body and return it with a receive callable that replays it.
+
+        Reading stops once more than max_bytes have arrived: the body is then None and the
+        replay hands the app what was read, followed by the rest of the stream.
+        """
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body and size <= max_bytes:
+            message = await receive()
+            if message["type"] != "http.request":
+                # Client went away; let the app see the disconnect
+                async def replay_disconnect():
+                    return message
+                return b"", replay_disconnect
+            chunk = message.get("body", b"")
+            chunks.append(chunk)
+            size += len(chunk)
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": more_body}
+            return await receive()
+
+        return (body if size <= max_bytes else None), replay
+
+    @staticmethod
+    async def _reject(send, retry_after: float) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"retry-after", str(max(1, int(retry_after + 0.999))).encode("ascii")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": b'{"detail":"Too many requests"}'})
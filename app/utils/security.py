@@ -1,12 +1,16 @@
 # app/utils/security.py
-from builtins import Exception, ValueError, bool, int, str
+from builtins import Exception, RuntimeError, ValueError, bool, int, max, str
+import asyncio
 import secrets
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 import bcrypt
 import os
 import jwt
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, Union
 from logging import getLogger
+from app.utils.metrics import password_hash_duration
 import os
 import jwt
 from datetime import datetime, timedelta
@@ -58,6 +62,109 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         logger.error("Error verifying password: %s", e)
         raise ValueError("Authentication process encountered an unexpected error") from e
 
+class PasswordHashQueueFull(RuntimeError):
+    """Raised when the password hashing pool has no room left in its queue."""
+
+class PasswordHashPool:
+    """
+    Bounded executor that keeps bcrypt work off the event loop.
+
+    At most ``max_workers`` jobs run at once and at most ``max_queue`` callers may
+    wait for a free worker; anything beyond that is rejected with
+    PasswordHashQueueFull so a login storm cannot pile up unbounded work.
+    Until ``start`` is called, jobs fall back to the loop's default executor.
+    """
+
+    def __init__(self):
+        self.executor_type = "process"
+        self.max_workers = 2
+        self.max_queue = 64
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def start(self, executor_type: str = "process", max_workers: int = 2, max_queue: int = 64) -> None:
+        """Create the underlying executor. Called from the application lifespan."""
+        if self._executor is not None:
+            return
+        if executor_type == "process":
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+        elif executor_type == "thread":
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        else:
+            raise ValueError(f"Unknown password hash executor type: {executor_type}")
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = executor
+        self._slots = asyncio.Semaphore(max_workers)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut the executor down; subsequent jobs use the fallback path."""
+        executor, self._executor, self._slots = self._executor, None, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    async def run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            with password_hash_duration.time(operation=func.__name__):
+                return await loop.run_in_executor(None, func, *args)
+
+        slots, executor = self._slots, self._executor
+        # Only callers that would block on a busy pool count against max_queue
+        if slots.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise PasswordHashQueueFull("Password hashing queue is full")
+
+        self.waiting += 1
+        enqueued_at = time.perf_counter()
+        try:
+            await slots.acquire()
+        finally:
+            self.waiting -= 1
+        waited = time.perf_counter() - enqueued_at
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+        self.running += 1
+        try:
+            with password_hash_duration.time(operation=func.__name__):
+                return await loop.run_in_executor(executor, func, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth and wait-time counters."""
+        return {
+            "executor": self.executor_type if self._executor is not None else "default",
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "queue_depth": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "total_wait_seconds": self.total_wait_seconds,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+password_hash_pool = PasswordHashPool()
+
+async def hash_password_async(password: str, rounds: int = 12) -> str:
+    """Async variant of hash_password that runs on the password hash pool."""
+    return await password_hash_pool.run(hash_password, password, rounds)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Async variant of verify_password that runs on the password hash pool."""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
 def generate_verification_token():
     """
     Generates a secure random token for email verification.
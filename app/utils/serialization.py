@@ -0,0 +1,42 @@
+from builtins import getattr, isinstance, len, str
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from pydantic import BaseModel
+
+# Fields of UserResponse, in its JSON order
+USER_RESPONSE_FIELDS = (
+    "email", "nickname", "first_name", "last_name", "bio", "profile_picture_url",
+    "linkedin_profile_url", "github_profile_url", "id", "role", "is_professional",
+)
+
+def link_payload(link: Any) -> Dict[str, Any]:
+    """JSON-ready dict for a link, given as a dict or a Link/PaginationLink model."""
+    return link.model_dump(mode="json") if isinstance(link, BaseModel) else link
+
+def user_payload(user: Any, links: Optional[Iterable[Any]] = None) -> Dict[str, Any]:
+    """
+    JSON-ready dict for a user, read straight from the ORM row.
+
+    Values are left as-is (Enum, datetime) for ORJSONResponse, which encodes them
+    natively, so no pydantic model is built or validated per user. The id is the
+    exception: asyncpg returns its own UUID subclass, which orjson rejects.
+    """
+    payload = {field: getattr(user, field) for field in USER_RESPONSE_FIELDS}
+    payload["id"] = str(user.id)
+    if links is not None:
+        payload["links"] = [link_payload(link) for link in links]
+    return payload
+
+def user_list_payload(users: Iterable[Any], links: Iterable[Any], total: Optional[int] = None, page: Optional[int] = None,
+                      next_cursor: Optional[str] = None, prev_cursor: Optional[str] = None,
+                      item_links: Optional[Callable[[Any], Iterable[Any]]] = None) -> Dict[str, Any]:
+    """JSON-ready dict matching UserListResponse; item_links(user), if given, supplies each item's links."""
+    items: List[Dict[str, Any]] = [user_payload(user, item_links(user) if item_links else None) for user in users]
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": len(items),
+        "links": [link_payload(link) for link in links],
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+    }
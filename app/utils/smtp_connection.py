@@ -1,31 +1,98 @@
 # smtp_client.py
-from builtins import Exception, int, str
-import smtplib
+from builtins import ConnectionError, Exception, bool, float, int, len, staticmethod, str
+import asyncio
+import logging
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from settings.config import settings
-import logging
+from typing import Any, Dict, List, Tuple
+import aiosmtplib
 
 class SMTPClient:
-    def __init__(self, server: str, port: int, username: str, password: str):
+    """
+    Async SMTP client keeping a pool of open, authenticated connections.
+
+    At most pool_size messages are sent at once, each over a connection taken from the
+    pool, so STARTTLS and login happen once per connection rather than once per email.
+    Connections idle longer than idle_timeout are replaced before use, and a pooled
+    connection the server has dropped is reconnected once before the send fails.
+    """
+
+    def __init__(self, server: str, port: int, username: str, password: str, pool_size: int = 2,
+                 start_tls: bool = True, timeout: float = 30.0, idle_timeout: float = 60.0):
         self.server = server
         self.port = port
         self.username = username
         self.password = password
+        self.pool_size = pool_size
+        self.start_tls = start_tls
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self._idle: List[Tuple[aiosmtplib.SMTP, float]] = []
+        self._slots = asyncio.Semaphore(pool_size)
+        self.connects = 0
+        self.reconnects = 0
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(hostname=self.server, port=self.port, timeout=self.timeout, start_tls=self.start_tls)
+        await smtp.connect()
+        if self.password:
+            await smtp.login(self.username, self.password)
+        self.connects += 1
+        return smtp
+
+    async def _acquire(self) -> Tuple[aiosmtplib.SMTP, bool]:
+        """An open connection, and whether it came from the pool (and so may have gone stale)."""
+        while self._idle:
+            smtp, released_at = self._idle.pop()
+            if smtp.is_connected and time.monotonic() - released_at < self.idle_timeout:
+                return smtp, True
+            await self._discard(smtp)
+        return await self._connect(), False
 
-    def send_email(self, subject: str, html_content: str, recipient: str):
+    def _release(self, smtp: aiosmtplib.SMTP):
+        self._idle.append((smtp, time.monotonic()))
+
+    @staticmethod
+    async def _discard(smtp: aiosmtplib.SMTP):
         try:
-            message = MIMEMultipart('alternative')
-            message['Subject'] = subject
-            message['From'] = self.username
-            message['To'] = recipient
-            message.attach(MIMEText(html_content, 'html'))
-
-            with smtplib.SMTP(self.server, self.port) as server:
-                server.starttls()  # Use TLS
-                server.login(self.username, self.password)
-                server.sendmail(self.username, recipient, message.as_string())
-            logging.info(f"Email sent to {recipient}")
-        except Exception as e:
-            logging.error(f"Failed to send email: {str(e)}")
-            raise
+            if smtp.is_connected:
+                await smtp.quit()
+        except Exception:
+            smtp.close()
+
+    async def send_email(self, subject: str, html_content: str, recipient: str):
+        message = MIMEMultipart('alternative')
+        message['Subject'] = subject
+        message['From'] = self.username
+        message['To'] = recipient
+        message.attach(MIMEText(html_content, 'html'))
+
+        async with self._slots:
+            smtp, pooled = await self._acquire()
+            try:
+                try:
+                    await smtp.send_message(message, sender=self.username, recipients=[recipient])
+                except (aiosmtplib.SMTPServerDisconnected, ConnectionError):
+                    if not pooled:
+                        raise
+                    # The server closed the pooled connection since its last use
+                    smtp.close()
+                    self.reconnects += 1
+                    smtp = await self._connect()
+                    await smtp.send_message(message, sender=self.username, recipients=[recipient])
+            except Exception as e:
+                smtp.close()
+                logging.error(f"Failed to send email: {str(e)}")
+                raise
+            self._release(smtp)
+        logging.info(f"Email sent to {recipient}")
+
+    async def close(self):
+        """Quit every pooled connection."""
+        idle, self._idle = self._idle, []
+        for smtp, _ in idle:
+            await self._discard(smtp)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"idle_connections": len(self._idle), "connects": self.connects, "reconnects": self.reconnects}
@@ -0,0 +1,46 @@
+from builtins import isinstance, len, str, zip
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterable, AsyncIterator, List, Sequence
+from uuid import UUID
+
+def export_value(value: Any) -> Any:
+    """Convert a column value to a JSON/CSV friendly scalar."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+async def iter_ndjson(rows: AsyncIterable[Sequence[Any]], fields: List[str], batch_size: int = 1000) -> AsyncIterator[bytes]:
+    """Encode rows as NDJSON, yielding one chunk per batch_size rows."""
+    buffer = []
+    async for row in rows:
+        buffer.append(json.dumps({field: export_value(value) for field, value in zip(fields, row)}))
+        if len(buffer) >= batch_size:
+            yield ("\n".join(buffer) + "\n").encode("utf-8")
+            buffer = []
+    if buffer:
+        yield ("\n".join(buffer) + "\n").encode("utf-8")
+
+async def iter_csv(rows: AsyncIterable[Sequence[Any]], fields: List[str], batch_size: int = 1000) -> AsyncIterator[bytes]:
+    """Encode rows as CSV with a header row, yielding one chunk per batch_size rows."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(fields)
+    pending = 0
+    async for row in rows:
+        writer.writerow([export_value(value) for value in row])
+        pending += 1
+        if pending >= batch_size:
+            yield output.getvalue().encode("utf-8")
+            output.seek(0)
+            output.truncate()
+            pending = 0
+    if output.tell():
+        yield output.getvalue().encode("utf-8")
@@ -0,0 +1,67 @@
+from builtins import dict, int, isinstance, len, next, str, zip
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Optional, Tuple
+
+# (row number, parsed row or None, error message or None)
+ParsedRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Decode a stream of UTF-8 byte chunks into lines, without buffering the whole body."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+async def iter_ndjson_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[ParsedRow]:
+    """Yield one parsed object per non-blank NDJSON line."""
+    row_number = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield row_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield row_number, None, "Row must be a JSON object"
+            continue
+        yield row_number, row, None
+
+async def iter_csv_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[ParsedRow]:
+    """
+    Yield one dict per CSV record, keyed by the header row.
+
+    Records may span lines inside quoted fields; a record is complete once its
+    quote count is even. Empty fields become None.
+    """
+    header = None
+    record = ""
+    row_number = 0
+    async for line in iter_lines(chunks):
+        record = f"{record}\n{line}" if record else line
+        if record.count('"') % 2:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row_number += 1
+        if len(values) != len(header):
+            yield row_number, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield row_number, {name: (value if value != "" else None) for name, value in zip(header, values)}, None
+    if record:
+        yield row_number + 1, None, "Unterminated quoted field"
@@ -1,11 +1,35 @@
+from builtins import int, len, range, str
+import html
+import os
+import re
 import markdown2
 from pathlib import Path
+from string import Formatter
+from typing import Dict, List, Tuple
+
+# Placeholder written into the markdown in place of each {field}; letters and digits
+# only, so markdown passes it through untouched (including inside link targets).
+_SLOT_MARKER = 'TPLSLOT{}X'
+_SLOT_PATTERN = re.compile(r'TPLSLOT(\d+)X')
 
 class TemplateManager:
     def __init__(self):
         # Dynamically determine the root path of the project
         self.root_dir = Path(__file__).resolve().parent.parent.parent  # Adjust this depending on the structure
         self.templates_dir = self.root_dir / 'email_templates'
+        self.styles = {
+            'body': 'font-family: Arial, sans-serif; font-size: 16px; color: #333333; background-color: #ffffff; line-height: 1.5;',
+            'h1': 'font-size: 24px; color: #333333; font-weight: bold; margin-top: 20px; margin-bottom: 10px;',
+            'p': 'font-size: 16px; color: #666666; margin: 10px 0; line-height: 1.6;',
+            'a': 'color: #0056b3; text-decoration: none; font-weight: bold;',
+            'footer': 'font-size: 12px; color: #777777; padding: 20px 0;',
+            'ul': 'list-style-type: none; padding: 0;',
+            'li': 'margin-bottom: 10px;'
+        }
+        tags = '|'.join(re.escape(tag) for tag in self.styles if tag != 'body')
+        self._tag_pattern = re.compile(f'<({tags})>')
+        # template name -> (file mtimes, compiled parts)
+        self._compiled: Dict[str, Tuple[Tuple[int, ...], List[str]]] = {}
 
     def _read_template(self, filename: str) -> str:
         """Private method to read template content."""
@@ -15,32 +39,53 @@ class TemplateManager:
 
     def _apply_email_styles(self, html: str) -> str:
         """Apply advanced CSS styles inline for email compatibility with excellent typography."""
-        styles = {
-            'body': 'font-family: Arial, sans-serif; font-size: 16px; color: #333333; background-color: #ffffff; line-height: 1.5;',
-            'h1': 'font-size: 24px; color: #333333; font-weight: bold; margin-top: 20px; margin-bottom: 10px;',
-            'p': 'font-size: 16px; color: #666666; margin: 10px 0; line-height: 1.6;',
-            'a': 'color: #0056b3; text-decoration: none; font-weight: bold;',
-            'footer': 'font-size: 12px; color: #777777; padding: 20px 0;',
-            'ul': 'list-style-type: none; padding: 0;',
-            'li': 'margin-bottom: 10px;'
-        }
-        # Wrap entire HTML content in <div> with body style
-        styled_html = f'<div style="{styles["body"]}">{html}</div>'
-        # Apply styles to each HTML element
-        for tag, style in styles.items():
-            if tag != 'body':  # Skip the body style since it's already applied to the <div>
-                styled_html = styled_html.replace(f'<{tag}>', f'<{tag} style="{style}">')
-        return styled_html
+        # Wrap entire HTML content in <div> with body style, then style every tag in one pass
+        styled_html = f'<div style="{self.styles["body"]}">{html}</div>'
+        return self._tag_pattern.sub(lambda m: f'<{m.group(1)} style="{self.styles[m.group(1)]}">', styled_html)
 
-    def render_template(self, template_name: str, **context) -> str:
-        """Render a markdown template with given context, applying advanced email styles."""
-        header = self._read_template('header.md')
-        footer = self._read_template('footer.md')
+    def _source_files(self, template_name: str) -> List[str]:
+        return ['header.md', f'{template_name}.md', 'footer.md']
+
+    def _compile(self, template_name: str) -> List[str]:
+        """
+        Compile a template into a styled HTML skeleton split around its slots.
 
-        # Read main template and format it with provided context
-        main_template = self._read_template(f'{template_name}.md')
-        main_content = main_template.format(**context)
+        The result alternates literal HTML and field names: even indices are HTML,
+        odd indices are the context keys to substitute.
+        """
+        header, main_template, footer = (self._read_template(name) for name in self._source_files(template_name))
+
+        fields: List[str] = []
+        main_parts = []
+        for literal, field_name, _, _ in Formatter().parse(main_template):
+            main_parts.append(literal)
+            if field_name is not None:
+                main_parts.append(_SLOT_MARKER.format(len(fields)))
+                fields.append(field_name)
+
+        full_markdown = f"{header}\n{''.join(main_parts)}\n{footer}"
+        skeleton = self._apply_email_styles(markdown2.markdown(full_markdown))
+
+        parts = _SLOT_PATTERN.split(skeleton)
+        for i in range(1, len(parts), 2):
+            parts[i] = fields[int(parts[i])]
+        return parts
+
+    def _get_compiled(self, template_name: str) -> List[str]:
+        mtimes = tuple(os.stat(self.templates_dir / name).st_mtime_ns for name in self._source_files(template_name))
+        cached = self._compiled.get(template_name)
+        if cached is None or cached[0] != mtimes:
+            cached = (mtimes, self._compile(template_name))
+            self._compiled[template_name] = cached
+        return cached[1]
+
+    def render_template(self, template_name: str, **context) -> str:
+        """Render a markdown template with given context, applying advanced email styles.
 
-        full_markdown = f"{header}\n{main_content}\n{footer}"
-        html_content = markdown2.markdown(full_markdown)
-        return self._apply_email_styles(html_content)
+        Values are HTML-escaped and substituted into the cached, pre-rendered skeleton.
+        """
+        parts = self._get_compiled(template_name)
+        rendered = parts[:]
+        for i in range(1, len(parts), 2):
+            rendered[i] = html.escape(str(context[parts[i]]))
+        return ''.join(rendered)
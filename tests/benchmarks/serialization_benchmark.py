@@ -0,0 +1,109 @@
+"""
+File: serialization_benchmark.py
+
+Overview:
+Per-request serialization time for user list pages of 10, 100 and 1000 items, comparing the
+pydantic path (UserResponse.model_validate per row, then jsonable_encoder and JSONResponse)
+with the direct path (user_list_payload rendered by ORJSONResponse). No database or HTTP is
+involved; rows are transient User objects.
+
+Usage:
+    python -m tests.benchmarks.serialization_benchmark
+    python -m tests.benchmarks.serialization_benchmark --sizes 10 100 1000 --repeat 200
+"""
+
+# Standard library imports
+from builtins import float, int, len, list, max, print, range, round, sorted, sum
+import argparse
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+# Third-party imports
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+# Application imports
+from app.models.user_model import User, UserRole
+from app.schemas.pagination_schema import PaginationLink
+from app.schemas.user_schemas import UserListResponse, UserResponse
+from app.utils.serialization import user_list_payload
+
+PAGE_SIZES = (10, 100, 1000)
+
+def make_users(count: int) -> List[User]:
+    now = datetime.now(timezone.utc)
+    return [
+        User(
+            id=uuid.uuid4(), nickname=f"bench_user_{i}", email=f"bench_user_{i}@example.com",
+            first_name="Bench", last_name=f"User {i}", bio="Benchmark user " * 4,
+            profile_picture_url="https://example.com/profiles/bench.jpg",
+            linkedin_profile_url="https://linkedin.com/in/bench", github_profile_url="https://github.com/bench",
+            role=UserRole.AUTHENTICATED, is_professional=False, created_at=now, updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+def make_links(limit: int) -> List[PaginationLink]:
+    base = "http://testserver/users/"
+    return [
+        PaginationLink(rel="self", href=f"{base}?skip=0&limit={limit}"),
+        PaginationLink(rel="first", href=f"{base}?skip=0&limit={limit}"),
+        PaginationLink(rel="next", href=f"{base}?skip={limit}&limit={limit}"),
+    ]
+
+def pydantic_path(users: List[User], links: List[PaginationLink]) -> bytes:
+    """What list_users did before: validate each row, build the response model, encode it."""
+    response = UserListResponse(
+        items=[UserResponse.model_validate(user) for user in users],
+        total=len(users), page=1, size=len(users), links=links,
+    )
+    return JSONResponse(jsonable_encoder(response)).body
+
+def direct_path(users: List[User], links: List[PaginationLink]) -> bytes:
+    return ORJSONResponse(user_list_payload(users, links, total=len(users), page=1)).body
+
+def time_per_call(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Mean and median wall time of func() in microseconds."""
+    func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    samples = sorted(samples)
+    return {
+        "mean_us": round(sum(samples) / len(samples) * 1e6, 1),
+        "p50_us": round(samples[len(samples) // 2] * 1e6, 1),
+    }
+
+def run(sizes=PAGE_SIZES, repeat: int = 100) -> Dict[int, Dict[str, Any]]:
+    results = {}
+    for size in sizes:
+        users, links = make_users(size), make_links(size)
+        # Fewer repetitions for large pages keep the whole run to a few seconds
+        rounds = max(5, repeat * 10 // size) if size > 10 else repeat
+        before = time_per_call(lambda: pydantic_path(users, links), rounds)
+        after = time_per_call(lambda: direct_path(users, links), rounds)
+        results[size] = {
+            "pydantic": before,
+            "direct": after,
+            "speedup": round(before["mean_us"] / after["mean_us"], 1) if after["mean_us"] else None,
+        }
+    return results
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="User list serialization benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(PAGE_SIZES))
+    parser.add_argument("--repeat", type=int, default=100, help="Timed calls for a 10-item page; scaled down for larger pages.")
+    args = parser.parse_args(argv)
+
+    print(f"{'items':>6} {'pydantic mean':>14} {'direct mean':>12} {'speedup':>8}")
+    for size, result in run(args.sizes, args.repeat).items():
+        print(f"{size:>6} {result['pydantic']['mean_us']:>12}us {result['direct']['mean_us']:>10}us {result['speedup']:>7}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+import os
+import pytest
+from tests.benchmarks.load_benchmark import SCENARIOS, compare_to_baseline, percentile, run_benchmark, summarize
+
+def scenario(p50=10.0, p95=20.0, p99=30.0, rps=100.0, errors=0):
+    return {"requests": 100, "errors": errors, "throughput_rps": rps, "p50_ms": p50, "p95_ms": p95, "p99_ms": p99}
+
+def test_percentile_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+def test_summarize_reports_milliseconds():
+    summary = summarize([0.010, 0.020, 0.030, 0.040], errors=1, elapsed=2.0)
+    assert summary["requests"] == 4
+    assert summary["errors"] == 1
+    assert summary["throughput_rps"] == 2.0
+    assert summary["p50_ms"] == 20.0
+    assert summary["p99_ms"] == 40.0
+
+def test_compare_to_baseline_flags_regressions():
+    baseline = {"scenarios": {"login": scenario(), "get_user": scenario()}}
+    results = {"scenarios": {"login": scenario(p99=45.0), "get_user": scenario(p95=22.0), "register": scenario()}}
+    regressions = compare_to_baseline(results, baseline, tolerance=0.2)
+    assert regressions == ["login: p99 45.0ms vs baseline 30.0ms"]
+
+def test_compare_to_baseline_flags_throughput_and_errors():
+    baseline = {"scenarios": {"login": scenario()}}
+    results = {"scenarios": {"login": scenario(rps=50.0, errors=3)}}
+    assert len(compare_to_baseline(results, baseline, tolerance=0.2)) == 2
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("base_url", [None, "http://localhost:8000"])
+async def test_load_benchmark_requires_explicit_database(base_url):
+    with pytest.raises(ValueError):
+        await run_benchmark(concurrency=1, requests=1, seed=1, scenarios=["login"], base_url=base_url)
+
+@pytest.mark.slow
+@pytest.mark.skipif(not (os.getenv("RUN_BENCHMARKS") and os.getenv("BENCHMARK_DATABASE_URL")),
+                    reason="set RUN_BENCHMARKS=1 and BENCHMARK_DATABASE_URL to run the load benchmark")
+@pytest.mark.asyncio
+async def test_load_benchmark_runs_every_scenario():
+    results = await run_benchmark(concurrency=4, requests=20, seed=20, scenarios=list(SCENARIOS),
+                                  database_url=os.environ["BENCHMARK_DATABASE_URL"])
+    assert set(results["scenarios"]) == set(SCENARIOS)
+    for name, summary in results["scenarios"].items():
+        assert summary["errors"] == 0, name
@@ -0,0 +1,10 @@
+import os
+import pytest
+from tests.benchmarks.serialization_benchmark import PAGE_SIZES, run
+
+@pytest.mark.slow
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run the serialization benchmark")
+def test_direct_serialization_is_faster_for_every_page_size():
+    results = run(PAGE_SIZES, repeat=20)
+    for size, result in results.items():
+        assert result["direct"]["mean_us"] < result["pydantic"]["mean_us"], f"page size {size}: {result}"
@@ -8,7 +8,7 @@ Fixtures:
 - `async_client`: Manages an asynchronous HTTP client for testing interactions with the FastAPI application.
 - `db_session`: Handles database transactions to ensure a clean database state for each test.
 - User fixtures (`user`, `locked_user`, `verified_user`, etc.): Set up various user states to test different behaviors under diverse conditions.
-- `token`: Generates an authentication token for testing secured endpoints.
+- `admin_token`, `manager_token`, `user_token`: Bearer tokens for the admin, manager and verified users.
 - `initialize_database`: Prepares the database at the session start.
 - `setup_database`: Sets up and tears down the database before and after each test.
 """
@@ -23,12 +23,13 @@ from uuid import uuid4
 import pytest
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, scoped_session
 from faker import Faker
 
 # Application-specific imports
-from app.main import app
+from app.main import app, rate_limit_backend
 from app.database import Base, Database
 from app.models.user_model import User, UserRole
 from app.dependencies import get_db, get_settings
@@ -36,6 +37,8 @@ from app.utils.security import hash_password
 from app.utils.template_manager import TemplateManager
 from app.services.email_service import EmailService
 from app.services.jwt_service import create_access_token
+from app.utils.security import create_access_token as create_user_token
+from settings.config import settings as app_settings
 
 fake = Faker()
 
@@ -59,6 +62,7 @@ def email_service():
 async def async_client(db_session):
     async with AsyncClient(app=app, base_url="http://testserver") as client:
         app.dependency_overrides[get_db] = lambda: db_session
+        rate_limit_backend.clear()
         try:
             yield client
         finally:
@@ -90,6 +94,23 @@ async def db_session(setup_database):
         finally:
             await session.close()
 
+@pytest.fixture
+def session_factory(setup_database):
+    """Opens independent sessions on their own connections, e.g. to run operations concurrently."""
+    return AsyncTestingSessionLocal
+
+@pytest.fixture
+def query_log():
+    """SQL statements sent to the test database while the test runs; clear() it before the code under test."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
 @pytest.fixture(scope="function")
 async def locked_user(db_session):
     unique_email = fake.email()
@@ -102,7 +123,7 @@ async def locked_user(db_session):
         "role": UserRole.AUTHENTICATED,
         "email_verified": False,
         "is_locked": True,
-        "failed_login_attempts": settings.max_login_attempts,
+        "failed_login_attempts": app_settings.max_login_attempts,
     }
     user = User(**user_data)
     db_session.add(user)
@@ -189,6 +210,7 @@ async def admin_user(db_session: AsyncSession):
         last_name="Doe",
         hashed_password="securepassword",
         role=UserRole.ADMIN,
+        email_verified=True,
         is_locked=False,
     )
     db_session.add(user)
@@ -204,12 +226,26 @@ async def manager_user(db_session: AsyncSession):
         email="manager_user@example.com",
         hashed_password="securepassword",
         role=UserRole.MANAGER,
+        email_verified=True,
         is_locked=False,
     )
     db_session.add(user)
     await db_session.commit()
     return user
 
+# Bearer tokens for the API tests, accepted by get_current_user for the seeded users
+@pytest.fixture
+def admin_token(admin_user):
+    return create_user_token(admin_user.id)
+
+@pytest.fixture
+def manager_token(manager_user):
+    return create_user_token(manager_user.id)
+
+@pytest.fixture
+def user_token(verified_user):
+    return create_user_token(verified_user.id)
+
 
 # Fixtures for common test data
 @pytest.fixture
@@ -1,4 +1,4 @@
-from builtins import str
+from builtins import int, range, str
 import pytest
 from httpx import AsyncClient
 from app.main import app
@@ -6,6 +6,7 @@ from app.models.user_model import User
 from app.utils.nickname_gen import generate_nickname
 from app.utils.security import hash_password
 from app.services.jwt_service import decode_token  # Import your FastAPI app
+from settings.config import settings
 
 # Example of a test function using the async_client fixture
 @pytest.mark.asyncio
@@ -51,6 +52,20 @@ async def test_update_user_email_access_allowed(async_client, admin_user, admin_
     assert response.status_code == 200
     assert response.json()["email"] == updated_data["email"]
 
+@pytest.mark.asyncio
+async def test_register_duplicate_nickname(async_client, verified_user):
+    user_data = {"email": "new_nickname_owner@example.com", "nickname": verified_user.nickname, "password": "AnotherPassword123!"}
+    response = await async_client.post("/register/", json=user_data)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Nickname already exists"
+
+@pytest.mark.asyncio
+async def test_update_user_duplicate_email(async_client, admin_user, verified_user, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.put(f"/users/{admin_user.id}", json={"email": verified_user.email}, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already exists"
+
 
 @pytest.mark.asyncio
 async def test_delete_user(async_client, admin_user, admin_token):
@@ -142,6 +157,19 @@ async def test_login_locked_user(async_client, locked_user):
     response = await async_client.post("/login/", data=urlencode(form_data), headers={"Content-Type": "application/x-www-form-urlencoded"})
     assert response.status_code == 400
     assert "Account locked due to too many failed login attempts." in response.json().get("detail", "")
+
+@pytest.mark.asyncio
+async def test_login_rate_limited_by_email(async_client, verified_user):
+    form_data = urlencode({"username": verified_user.email, "password": "WrongPassword$1234"})
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    limit = settings.rate_limits["/login/"]["email"].split("/")[0]
+    for _ in range(int(limit)):
+        response = await async_client.post("/login/", data=form_data, headers=headers)
+        assert response.status_code in (400, 401)  # wrong password, then locked
+    response = await async_client.post("/login/", data=form_data, headers=headers)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
 @pytest.mark.asyncio
 async def test_delete_user_does_not_exist(async_client, admin_token):
     non_existent_user_id = "00000000-0000-0000-0000-000000000000"  # Valid UUID format
@@ -174,6 +202,82 @@ async def test_list_users_as_admin(async_client, admin_token):
     assert response.status_code == 200
     assert 'items' in response.json()
 
+@pytest.mark.asyncio
+async def test_list_users_without_total(async_client, admin_token):
+    response = await async_client.get(
+        "/users/?include_total=false",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+    assert response.json()["total"] is None
+    assert "last" not in [link["rel"] for link in response.json()["links"]]
+
+@pytest.mark.asyncio
+async def test_search_users(async_client, admin_token, verified_user):
+    response = await async_client.get(
+        "/users/search",
+        params={"q": verified_user.email},
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+    assert response.json()["items"][0]["id"] == str(verified_user.id)
+    assert "q=" in response.json()["links"][0]["href"]
+
+@pytest.mark.asyncio
+async def test_search_users_unauthorized(async_client, user_token):
+    response = await async_client.get("/users/search?q=john", headers={"Authorization": f"Bearer {user_token}"})
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_list_users_with_filters(async_client, admin_token):
+    response = await async_client.get(
+        "/users/?role=ADMIN&is_locked=false&sort=-created_at",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+    assert all(item["role"] == "ADMIN" for item in response.json()["items"])
+    assert "role=ADMIN" in response.json()["links"][0]["href"]
+
+@pytest.mark.asyncio
+async def test_list_users_rejects_unsupported_sort(async_client, admin_token):
+    response = await async_client.get("/users/?sort=bio", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_list_users_links_opt_out(async_client, admin_token, verified_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    with_links = (await async_client.get("/users/", headers=headers)).json()
+    assert with_links["items"][0]["links"][0]["rel"] == "self"
+    without_links = (await async_client.get("/users/?links=false", headers=headers)).json()
+    assert without_links["links"] == []
+    assert "links" not in without_links["items"][0]
+
+@pytest.mark.asyncio
+async def test_get_user_conditional(async_client, admin_token, admin_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get(f"/users/{admin_user.id}", headers=headers)
+    etag = response.headers["ETag"]
+    assert "no-cache" in response.headers["Cache-Control"]
+    response = await async_client.get(f"/users/{admin_user.id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+@pytest.mark.asyncio
+async def test_list_users_conditional(async_client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    etag = (await async_client.get("/users/", headers=headers)).headers["ETag"]
+    response = await async_client.get("/users/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+@pytest.mark.asyncio
+async def test_update_user_rejects_stale_if_match(async_client, admin_token, admin_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    etag = (await async_client.get(f"/users/{admin_user.id}", headers=headers)).headers["ETag"]
+    response = await async_client.put(f"/users/{admin_user.id}", json={"bio": "first"}, headers={**headers, "If-Match": etag})
+    assert response.status_code == 200
+    response = await async_client.put(f"/users/{admin_user.id}", json={"bio": "second"}, headers={**headers, "If-Match": etag})
+    assert response.status_code == 412
+
 @pytest.mark.asyncio
 async def test_list_users_as_manager(async_client, manager_token):
     response = await async_client.get(
@@ -189,3 +293,28 @@ async def test_list_users_unauthorized(async_client, user_token):
         headers={"Authorization": f"Bearer {user_token}"}
     )
     assert response.status_code == 403  # Forbidden, as expected for regular user
+
+@pytest.mark.asyncio
+async def test_bulk_lock_users(async_client, admin_token, users_with_same_role_50_users):
+    ids = [str(user.id) for user in users_with_same_role_50_users[:3]]
+    missing = "00000000-0000-0000-0000-000000000000"
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.post("/users/bulk/lock", json={"ids": ids + [missing]}, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["affected"] == 3 and body["not_found"] == 1
+    assert body["results"][-1] == {"id": missing, "status": "not_found"}
+
+@pytest.mark.asyncio
+async def test_bulk_set_role_requires_admin(async_client, manager_token, verified_user):
+    headers = {"Authorization": f"Bearer {manager_token}"}
+    response = await async_client.post("/users/bulk/role", json={"ids": [str(verified_user.id)], "role": "ADMIN"}, headers=headers)
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_bulk_request_rejects_too_many_ids(async_client, admin_token, mocker):
+    mocker.patch.object(settings, "user_bulk_max_ids", 1)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    ids = ["00000000-0000-0000-0000-000000000001", "00000000-0000-0000-0000-000000000002"]
+    response = await async_client.post("/users/bulk/delete", json={"ids": ids}, headers=headers)
+    assert response.status_code == 400
@@ -12,3 +12,55 @@ async def test_send_markdown_email(email_service):
     }
     await email_service.send_user_email(user_data, 'email_verification')
     # Manual verification in Mailtrap
+
+@pytest.mark.asyncio
+async def test_queued_email_is_sent_by_worker(email_service, mocker):
+    send = mocker.patch.object(email_service.smtp_client, "send_email")
+    await email_service.start(workers=1, queue_maxsize=10)
+    await email_service.send_user_email({
+        "email": "queued@example.com",
+        "name": "Queued User",
+        "verification_url": "http://example.com/verify?token=abc123"
+    }, 'email_verification')
+    await email_service.stop()
+    send.assert_called_once()
+    assert send.call_args.args[2] == "queued@example.com"
+    assert email_service.stats()["sent"] == 1
+    assert email_service.stats()["queue_depth"] == 0
+
+@pytest.mark.asyncio
+async def test_queued_email_is_retried(email_service, mocker):
+    send = mocker.patch.object(email_service.smtp_client, "send_email", side_effect=[ConnectionError("boom"), None])
+    email_service.retry_backoff_seconds = 0
+    await email_service.start(workers=1, queue_maxsize=10)
+    await email_service.send_user_email({
+        "email": "retry@example.com",
+        "name": "Retry User",
+        "verification_url": "http://example.com/verify?token=abc123"
+    }, 'email_verification')
+    await email_service.stop()
+    assert send.call_count == 2
+    stats = email_service.stats()
+    assert stats["retried"] == 1
+    assert stats["sent"] == 1
+    assert stats["failed"] == 0
+
+@pytest.mark.asyncio
+async def test_queued_email_gives_up_after_max_retries(email_service, mocker):
+    send = mocker.patch.object(email_service.smtp_client, "send_email", side_effect=ConnectionError("boom"))
+    email_service.retry_backoff_seconds = 0
+    email_service.max_retries = 2
+    await email_service.start(workers=1, queue_maxsize=10)
+    await email_service.send_user_email({
+        "email": "fail@example.com",
+        "name": "Fail User",
+        "verification_url": "http://example.com/verify?token=abc123"
+    }, 'email_verification')
+    await email_service.stop()
+    assert send.call_count == 3
+    assert email_service.stats()["failed"] == 1
+
+@pytest.mark.asyncio
+async def test_invalid_email_type_is_rejected(email_service):
+    with pytest.raises(ValueError):
+        await email_service.send_user_email({"email": "x@example.com"}, 'newsletter')
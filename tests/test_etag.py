@@ -0,0 +1,43 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from app.utils.etag import if_match_versions, if_none_match, page_etag, user_etag
+
+NOW = datetime(2024, 4, 20, 21, 20, 32, 123456, tzinfo=timezone.utc)
+
+def make_user(updated_at=NOW):
+    return SimpleNamespace(id=uuid.uuid4(), updated_at=updated_at)
+
+def test_user_etag_changes_with_updated_at_and_representation():
+    assert user_etag(NOW) == user_etag(NOW)
+    assert user_etag(NOW) != user_etag(NOW + timedelta(microseconds=1))
+    assert user_etag(NOW) != user_etag(NOW, links=False)
+    assert user_etag(NOW).startswith('"') and user_etag(NOW).endswith('"')
+
+def test_page_etag_tracks_membership_updates_and_state():
+    users = [make_user(), make_user()]
+    etag = page_etag("http://testserver?limit=2", users, 10, True)
+    assert etag == page_etag("http://testserver?limit=2", users, 10, True)
+    assert etag != page_etag("http://testserver?limit=2", users[:1], 10, True)
+    assert etag != page_etag("http://testserver?limit=2", users, 11, True)
+    assert etag != page_etag("http://testserver?limit=2", users, 10, False)
+    assert etag != page_etag("http://testserver?limit=3", users, 10, True)
+    users[1].updated_at = NOW + timedelta(seconds=1)
+    assert etag != page_etag("http://testserver?limit=2", users, 10, True)
+
+def test_if_none_match_uses_weak_comparison():
+    etag = user_etag(NOW)
+    assert if_none_match(etag, etag)
+    assert if_none_match(f'"other", W/{etag}', etag)
+    assert if_none_match("*", etag)
+    assert not if_none_match('"other"', etag)
+    assert not if_none_match(None, etag)
+
+def test_if_match_versions_round_trips_user_etags():
+    assert if_match_versions(None) is None
+    assert if_match_versions("*") is None
+    assert if_match_versions(user_etag(NOW)) == [NOW]
+    assert if_match_versions(f"{user_etag(NOW, links=False)}, {user_etag(NOW + timedelta(seconds=1))}") == [NOW, NOW + timedelta(seconds=1)]
+    # Weak and foreign tags never match, so the update fails its precondition
+    assert if_match_versions(f"W/{user_etag(NOW)}") == []
+    assert if_match_versions('"not-a-version"') == []
@@ -1,12 +1,14 @@
 from builtins import len, max, sorted, str
 from unittest.mock import MagicMock
 from urllib.parse import parse_qs, urlparse, parse_qsl, urlunparse, urlencode
+from datetime import datetime, timezone
 from uuid import uuid4
 
 import pytest
-from fastapi import Request
+from fastapi import FastAPI, Request
 
-from app.utils.link_generation import create_link, create_pagination_link, create_user_links, generate_pagination_links
+from app.utils.cursor import decode_cursor, decode_rank_cursor, encode_cursor, encode_rank_cursor
+from app.utils.link_generation import create_link, create_pagination_link, create_user_links, generate_cursor_pagination_links, generate_pagination_links, link_templates
 
 from urllib.parse import urlparse, parse_qs, urlunparse, urlencode
 
@@ -24,10 +26,12 @@ def normalize_url(url):
 
 @pytest.fixture
 def mock_request():
-    request = MagicMock(spec=Request)
-    request.url_for = MagicMock(side_effect=lambda action, user_id: f"http://testserver/{action}/{user_id}")
-    request.url = "http://testserver/users"
-    return request
+    app = FastAPI()
+    for name in ("get_user", "update_user", "delete_user"):
+        app.add_api_route("/users/{user_id}", lambda user_id: None, name=name)
+    link_templates.compile(app)
+    return Request({"type": "http", "scheme": "http", "server": ("testserver", 80), "path": "/users",
+                    "root_path": "", "query_string": b"", "headers": [], "app": app})
 
 def test_create_link():
     link = create_link("self", "http://example.com", "GET", "view")
@@ -37,9 +41,15 @@ def test_create_user_links(mock_request):
     user_id = uuid4()
     links = create_user_links(user_id, mock_request)
     assert len(links) == 3
-    assert normalize_url(str(links[0].href)) == f"http://testserver/get_user/{user_id}"
-    assert normalize_url(str(links[1].href)) == f"http://testserver/update_user/{user_id}"
-    assert normalize_url(str(links[2].href)) == f"http://testserver/delete_user/{user_id}"
+    assert [link["rel"] for link in links] == ["self", "update", "delete"]
+    assert all(link["href"] == f"http://testserver/users/{user_id}" for link in links)
+
+def test_create_user_links_with_server_base_url(mock_request, monkeypatch):
+    from settings.config import settings
+    monkeypatch.setattr(settings, "links_use_server_base_url", True)
+    monkeypatch.setattr(settings, "server_base_url", "https://api.example.com/")
+    user_id = uuid4()
+    assert create_user_links(user_id, mock_request)[0]["href"] == f"https://api.example.com/users/{user_id}"
 
 def test_generate_pagination_links(mock_request):
     skip = 10
@@ -48,4 +58,45 @@ def test_generate_pagination_links(mock_request):
     links = generate_pagination_links(mock_request, skip, limit, total_items)
     assert len(links) >= 4
     expected_self_url = "http://testserver/users?limit=5&skip=10"
-    assert normalize_url(str(links[0].href)) == normalize_url(expected_self_url), "Self link should match expected URL"
+    assert normalize_url(links[0]['href']) == normalize_url(expected_self_url), "Self link should match expected URL"
+
+def test_generate_pagination_links_without_total(mock_request):
+    links = generate_pagination_links(mock_request, 10, 5, None, has_more=True)
+    rels = [link['rel'] for link in links]
+    assert "last" not in rels
+    assert "next" in rels
+    assert "prev" in rels
+
+def test_generate_pagination_links_without_total_on_last_page(mock_request):
+    links = generate_pagination_links(mock_request, 10, 5, None, has_more=False)
+    assert [link['rel'] for link in links] == ["self", "first", "prev"]
+
+def test_generate_pagination_links_keeps_params(mock_request):
+    links = generate_pagination_links(mock_request, 0, 5, 20, params={"role": "ADMIN", "sort": "-created_at"})
+    assert normalize_url(links[0]['href']) == normalize_url("http://testserver/users?skip=0&limit=5&role=ADMIN&sort=-created_at")
+
+def test_generate_cursor_pagination_links(mock_request):
+    links = generate_cursor_pagination_links(mock_request, 5, "abc", "def", None)
+    rels = [link['rel'] for link in links]
+    assert rels == ["self", "first", "next"]
+    assert normalize_url(links[2]['href']) == normalize_url("http://testserver/users?cursor=def&limit=5")
+
+def test_generate_cursor_pagination_links_keeps_params(mock_request):
+    links = generate_cursor_pagination_links(mock_request, 5, None, "def", None, params={"q": "john doe"})
+    assert normalize_url(links[2]['href']) == normalize_url("http://testserver/users?cursor=def&limit=5&q=john+doe")
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 4, 20, 21, 20, 32, tzinfo=timezone.utc)
+    user_id = uuid4()
+    cursor = encode_cursor(created_at, user_id, "prev")
+    assert decode_cursor(cursor) == (created_at, user_id, "prev")
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+def test_rank_cursor_round_trip():
+    user_id = uuid4()
+    assert decode_rank_cursor(encode_rank_cursor(0.0607927, user_id)) == (0.0607927, user_id)
+    with pytest.raises(ValueError):
+        decode_rank_cursor(encode_cursor(datetime.now(timezone.utc), user_id))
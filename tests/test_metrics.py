@@ -0,0 +1,75 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from app.routers import metrics_routes
+from app.utils.metrics import MetricsMiddleware, MetricsRegistry, http_request_duration, statement_type
+from settings.config import settings
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("job_seconds", "Job time.", buckets=(0.1, 1.0))
+    histogram.observe(0.05, job="a")
+    histogram.observe(0.5, job="a")
+    histogram.observe(5.0, job="a")
+    text = registry.render()
+    assert 'job_seconds_bucket{job="a",le="0.1"} 1' in text
+    assert 'job_seconds_bucket{job="a",le="1.0"} 2' in text
+    assert 'job_seconds_bucket{job="a",le="+Inf"} 3' in text
+    assert 'job_seconds_count{job="a"} 3' in text
+    assert histogram.snapshot(job="a") == (5.55, 3)
+
+def test_collectors_render_numeric_values_as_gauges():
+    registry = MetricsRegistry()
+    registry.register_collector("pool", lambda: {"size": 5, "executor": "thread", "enabled": True})
+    text = registry.render()
+    assert "pool_size 5" in text
+    assert "pool_executor" not in text
+    assert "pool_enabled" not in text
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("events_total", "Events.").inc(kind='say "hi"\n')
+    assert 'events_total{kind="say \\"hi\\"\\n"} 1.0' in registry.render()
+
+@pytest.mark.parametrize("statement,expected", [
+    ("SELECT 1", "SELECT"),
+    ("  update users set x = 1", "UPDATE"),
+    ("BEGIN", "OTHER"),
+    ("", "OTHER"),
+])
+def test_statement_type(statement, expected):
+    assert statement_type(statement) == expected
+
+@pytest.mark.asyncio
+async def test_middleware_labels_requests_by_route_name():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/things/{thing_id}", name="get_thing")
+    async def get_thing(thing_id: int):
+        return {"id": thing_id}
+
+    before = http_request_duration.snapshot(route="get_thing", method="GET", status="200")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+        await client.get("/things/1")
+        await client.get("/things/2")
+        await client.get("/nowhere")
+    after = http_request_duration.snapshot(route="get_thing", method="GET", status="200")
+    assert after[1] - (before[1] if before else 0) == 2
+    assert http_request_duration.snapshot(route="unmatched", method="GET", status="404") is not None
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("token,authorization,expected", [
+    (None, "Bearer anything", 404),
+    ("scrape-secret", None, 401),
+    ("scrape-secret", "Bearer wrong", 401),
+    ("scrape-secret", "Bearer scrape-secret", 200),
+])
+async def test_metrics_route_requires_configured_token(monkeypatch, token, authorization, expected):
+    monkeypatch.setattr(settings, "metrics_token", token)
+    app = FastAPI()
+    app.include_router(metrics_routes.router)
+    headers = {"Authorization": authorization} if authorization else {}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+        response = await client.get("/metrics", headers=headers)
+    assert response.status_code == expected
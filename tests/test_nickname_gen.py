@@ -0,0 +1,14 @@
+import re
+from app.utils.nickname_gen import ADJECTIVES, ANIMALS, NUMBER_RANGE, generate_nickname, generate_nicknames
+
+def test_generate_nickname_is_url_safe():
+    nickname = generate_nickname()
+    assert re.fullmatch(r"[a-z]+_[a-z]+_\d+", nickname)
+    assert 3 <= len(nickname) <= 50
+
+def test_word_space_is_large():
+    assert len(set(ADJECTIVES)) * len(set(ANIMALS)) * NUMBER_RANGE >= 40_000_000
+
+def test_generate_nicknames_distinct_and_excluded(mocker):
+    mocker.patch("app.utils.nickname_gen.generate_nickname", side_effect=["a_b_1", "a_b_1", "a_b_2", "a_b_3", "a_b_4"])
+    assert generate_nicknames(2, exclude={"a_b_2"}) == ["a_b_1", "a_b_3"]
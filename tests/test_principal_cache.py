@@ -0,0 +1,53 @@
+from uuid import uuid4
+import pytest
+from app.models.user_model import UserRole
+from app.utils.principal_cache import Principal, PrincipalCache
+
+def make_principal(**overrides):
+    values = {"id": uuid4(), "role": UserRole.ADMIN, "email_verified": True, "is_locked": False}
+    values.update(overrides)
+    return Principal(**values)
+
+def test_get_counts_hits_and_misses():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    principal = make_principal()
+    assert cache.get(principal.id) is None
+    cache.set(principal)
+    assert cache.get(str(principal.id)) == principal
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+def test_entries_expire_after_ttl(mocker):
+    clock = mocker.patch("app.utils.principal_cache.time.monotonic", return_value=100.0)
+    cache = PrincipalCache(max_size=10, ttl_seconds=5)
+    principal = make_principal()
+    cache.set(principal)
+    clock.return_value = 106.0
+    assert cache.get(principal.id) is None
+    assert cache.stats()["size"] == 0
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PrincipalCache(max_size=2, ttl_seconds=60)
+    first, second, third = make_principal(), make_principal(), make_principal()
+    cache.set(first)
+    cache.set(second)
+    cache.get(first.id)
+    cache.set(third)
+    assert cache.get(second.id) is None
+    assert cache.get(first.id) == first
+    assert cache.stats()["evictions"] == 1
+
+def test_invalidate_removes_entry():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    principal = make_principal()
+    cache.set(principal)
+    cache.invalidate(principal.id)
+    assert cache.get(principal.id) is None
+    assert cache.stats()["invalidations"] == 1
+
+def test_zero_size_disables_cache():
+    cache = PrincipalCache(max_size=0, ttl_seconds=60)
+    principal = make_principal()
+    cache.set(principal)
+    assert cache.get(principal.id) is None
@@ -0,0 +1,87 @@
+from builtins import dict, list, range
+import logging
+import pytest
+from sqlalchemy import create_engine, text
+from app.utils.query_stats import (
+    QueryStats, QueryStatsMiddleware, current_query_stats, instrument_query_stats, redact_parameters, statement_shape,
+)
+
+def test_statement_shape_collapses_placeholders_and_in_lists():
+    assert statement_shape("SELECT * FROM users\n  WHERE id = $1") == "SELECT * FROM users WHERE id = ?"
+    assert statement_shape("SELECT * FROM users WHERE id IN ($1, $2, $3)") == statement_shape("SELECT * FROM users WHERE id IN ($7)")
+    assert statement_shape("UPDATE users SET email=%(email)s WHERE id = %s") == "UPDATE users SET email=? WHERE id = ?"
+
+def test_redact_parameters_hides_values():
+    assert redact_parameters(("john@example.com", "hash")) == "(?, ?)"
+    assert redact_parameters({"email": "john@example.com"}) == "{email=?}"
+    assert redact_parameters([("a",), ("b",)]) == "[2 parameter sets]"
+    assert "john@example.com" not in redact_parameters(["john@example.com"])
+
+def test_query_stats_repeated_shapes():
+    stats = QueryStats()
+    for i in range(3):
+        stats.record(f"SELECT * FROM users WHERE id = ${i + 1}", 0.01)
+    stats.record("SELECT count(*) FROM users", 0.01)
+    assert stats.count == 4
+    assert stats.repeated(3) == [("SELECT * FROM users WHERE id = ?", 3)]
+    assert stats.server_timing() == 'db;dur=40.0;desc="4 queries"'
+
+async def _asgi(middleware, scope):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    return messages
+
+def _app(queries):
+    async def app(scope, receive, send):
+        stats = current_query_stats()
+        for _ in range(queries):
+            stats.record("SELECT * FROM users WHERE id = $1", 0.002)
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b"{}"})
+    return app
+
+@pytest.mark.asyncio
+async def test_middleware_adds_headers_when_exposed():
+    scope = {"type": "http", "method": "GET", "path": "/users/"}
+    messages = await _asgi(QueryStatsMiddleware(_app(2), expose_headers=True), scope)
+    headers = dict(messages[0]["headers"])
+    assert headers[b"x-db-queries"] == b"2"
+    assert headers[b"server-timing"].startswith(b"db;dur=")
+    assert current_query_stats() is None
+
+    messages = await _asgi(QueryStatsMiddleware(_app(2)), scope)
+    assert b"x-db-queries" not in dict(messages[0]["headers"])
+
+@pytest.mark.asyncio
+async def test_middleware_logs_likely_n_plus_one(caplog):
+    scope = {"type": "http", "method": "GET", "path": "/users/"}
+    with caplog.at_level(logging.WARNING, logger="app.utils.query_stats"):
+        await _asgi(QueryStatsMiddleware(_app(2), n_plus_one_threshold=3), scope)
+        assert "Possible N+1" not in caplog.text
+        await _asgi(QueryStatsMiddleware(_app(3), n_plus_one_threshold=3), scope)
+    assert "Possible N+1 in GET /users/: 3 executions of SELECT * FROM users WHERE id = ?" in caplog.text
+
+@pytest.mark.asyncio
+async def test_instrumented_engine_counts_statements_and_logs_slow_queries(caplog):
+    engine = create_engine("sqlite://")
+    instrument_query_stats(engine, slow_query_seconds=0.0)
+
+    async def app(scope, receive, send):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT :email"), {"email": "secret@example.com"})
+            conn.execute(text("SELECT :email"), {"email": "other@example.com"})
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    with caplog.at_level(logging.WARNING, logger="app.utils.query_stats"):
+        messages = await _asgi(QueryStatsMiddleware(app, expose_headers=True), {"type": "http", "method": "GET", "path": "/"})
+    assert dict(messages[0]["headers"])[b"x-db-queries"] == b"2"
+    assert "Slow query" in caplog.text and "parameters=(?)" in caplog.text
+    assert "secret@example.com" not in caplog.text
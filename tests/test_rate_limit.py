@@ -0,0 +1,135 @@
+from builtins import bool, dict, list
+import json
+import pytest
+from app.utils.rate_limit import (
+    MemoryRateLimitBackend, RateLimit, RateLimitBackend, RateLimitMiddleware, body_email, client_ip, parse_route_limits,
+)
+
+def test_rate_limit_parse():
+    assert RateLimit.parse("5/60") == RateLimit(5, 60.0)
+    for spec in ("5", "a/60", "0/60", "5/0"):
+        with pytest.raises(ValueError):
+            RateLimit.parse(spec)
+
+def test_parse_route_limits_rejects_unknown_keys():
+    assert parse_route_limits({"/login/": {"ip": "2/1"}}) == {"/login/": {"ip": RateLimit(2, 1.0)}}
+    with pytest.raises(ValueError):
+        parse_route_limits({"/login/": {"user": "2/1"}})
+
+@pytest.mark.asyncio
+async def test_memory_backend_allows_burst_then_refills(mocker):
+    clock = mocker.patch("app.utils.rate_limit.time.monotonic", return_value=100.0)
+    backend = MemoryRateLimitBackend()
+    limit = RateLimit(2, 10.0)
+    assert (await backend.hit("k", limit))[0]
+    assert (await backend.hit("k", limit))[0]
+    allowed, retry_after = await backend.hit("k", limit)
+    assert not allowed and retry_after == pytest.approx(5.0)
+    assert (await backend.hit("other", limit))[0]
+    clock.return_value = 105.0
+    assert (await backend.hit("k", limit))[0]
+    assert backend.stats() == {"keys": 2, "allowed": 4, "rejected": 1}
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryRateLimitBackend(max_keys=2)
+    limit = RateLimit(1, 60.0)
+    for key in ("a", "b", "c"):
+        await backend.hit(key, limit)
+    assert backend.stats()["keys"] == 2
+    assert (await backend.hit("a", limit))[0]
+
+def test_client_ip_takes_the_address_added_by_the_trusted_proxy():
+    scope = {"client": ("10.0.0.2", 1234), "headers": [(b"x-forwarded-for", b"6.6.6.6, 203.0.113.9")]}
+    assert client_ip(scope, 1) == "203.0.113.9"
+    assert client_ip(scope, 2) == "6.6.6.6"
+    assert client_ip(scope, 5) == "6.6.6.6"
+    assert client_ip(scope, 0) == "10.0.0.2"
+    assert client_ip({"client": ("10.0.0.2", 1234), "headers": []}, 1) == "10.0.0.2"
+
+def test_body_email():
+    assert body_email(b"username=Jane%40Example.com&password=x", "application/x-www-form-urlencoded") == "jane@example.com"
+    assert body_email(b'{"email": " Jane@Example.com ", "password": "x"}', "application/json") == "jane@example.com"
+    assert body_email(b"not json", "application/json") is None
+    assert body_email(b'["a"]', "application/json") is None
+    assert body_email(b"x", "text/plain") is None
+
+async def call(middleware, path, body=b"", headers=(), method="POST"):
+    """Run one request through middleware, returning (status, headers, app_received_body)."""
+    received = []
+    sent = []
+
+    async def app(scope, receive, send):
+        message = await receive()
+        received.append(message["body"])
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    chunks = [body[:3], body[3:]]
+
+    async def receive():
+        chunk = chunks.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    async def send(message):
+        sent.append(message)
+
+    middleware.app = app
+    scope = {"type": "http", "method": method, "path": path, "client": ("127.0.0.1", 5000), "headers": list(headers)}
+    await middleware(scope, receive, send)
+    return sent[0]["status"], dict(sent[0]["headers"]), received
+
+def make_middleware(limits):
+    return RateLimitMiddleware(None, parse_route_limits(limits), MemoryRateLimitBackend(), trusted_proxies=1)
+
+@pytest.mark.asyncio
+async def test_middleware_limits_by_ip_without_reading_the_body():
+    middleware = make_middleware({"/login/": {"ip": "2/60"}})
+    assert (await call(middleware, "/login/"))[0] == 200
+    assert (await call(middleware, "/login/"))[0] == 200
+    status, headers, received = await call(middleware, "/login/")
+    assert status == 429 and received == []
+    assert headers[b"retry-after"] == b"30"
+    # Another client behind the proxy has its own bucket
+    assert (await call(middleware, "/login/", headers=[(b"x-forwarded-for", b"198.51.100.7")]))[0] == 200
+    # Other paths and methods pass through
+    assert (await call(middleware, "/users/"))[0] == 200
+    assert (await call(middleware, "/login/", method="GET"))[0] == 200
+
+@pytest.mark.asyncio
+async def test_middleware_limits_by_email_and_replays_the_body():
+    middleware = make_middleware({"/register/": {"ip": "100/60", "email": "1/60"}})
+    body = json.dumps({"email": "Target@example.com", "password": "x"}).encode()
+    headers = [(b"content-type", b"application/json")]
+    status, _, received = await call(middleware, "/register/", body, headers)
+    assert status == 200 and received == [body]
+    other = json.dumps({"email": "target@EXAMPLE.com"}).encode()
+    status, _, received = await call(middleware, "/register/", other, [*headers, (b"x-forwarded-for", b"198.51.100.7")])
+    assert status == 429 and received == []
+    assert (await call(middleware, "/register/", b'{"email": "other@example.com"}', headers))[0] == 200
+
+@pytest.mark.asyncio
+async def test_middleware_stops_buffering_oversized_bodies():
+    middleware = make_middleware({"/register/": {"email": "1/60"}})
+    middleware.MAX_BODY_BYTES = 16
+    chunks = [b'{"email": ', b'"target@example.com", ', b'"password": "x"}']
+    pending = list(chunks)
+
+    async def receive():
+        chunk = pending.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(pending)}
+
+    body, replay = await middleware._buffer_body(receive, middleware.MAX_BODY_BYTES)
+    assert body is None
+    assert len(pending) == 1  # the last chunk was not read ahead of the app
+    assert await replay() == {"type": "http.request", "body": chunks[0] + chunks[1], "more_body": True}
+    assert (await replay())["body"] == chunks[2]
+    # Without an email key, oversized requests are never limited by email
+    oversized = b"".join(chunks)
+    headers = [(b"content-type", b"application/json")]
+    assert (await call(middleware, "/register/", oversized, headers))[0] == 200
+    assert (await call(middleware, "/register/", oversized, headers))[0] == 200
+
+def test_rate_limit_backend_is_abstract():
+    with pytest.raises(TypeError):
+        RateLimitBackend()
@@ -1,7 +1,11 @@
 # test_security.py
 from builtins import RuntimeError, ValueError, isinstance, str
+import asyncio
 import pytest
-from app.utils.security import hash_password, verify_password
+from app.utils.security import (
+    PasswordHashPool, PasswordHashQueueFull, hash_password, hash_password_async,
+    verify_password, verify_password_async,
+)
 
 def test_hash_password():
     """Test that hashing password returns a bcrypt hashed string."""
@@ -65,3 +69,45 @@ def test_hash_password_internal_error(monkeypatch):
     with pytest.raises(ValueError):
         hash_password("test")
 
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_password_async():
+    """Async variants produce hashes compatible with the sync functions."""
+    hashed = await hash_password_async("secure_password", 4)
+    assert verify_password("secure_password", hashed) is True
+    assert await verify_password_async("secure_password", hashed) is True
+    assert await verify_password_async("wrong_password", hashed) is False
+
+@pytest.mark.asyncio
+async def test_password_hash_pool_counts_jobs():
+    """A started pool runs jobs on its executor and tracks completion and wait time."""
+    pool = PasswordHashPool()
+    pool.start(executor_type="thread", max_workers=1, max_queue=4)
+    try:
+        hashes = await asyncio.gather(*(pool.run(hash_password, "pw", 4) for _ in range(3)))
+    finally:
+        pool.shutdown()
+    assert all(h.startswith('$2b$') for h in hashes)
+    stats = pool.stats()
+    assert stats["completed"] == 3
+    assert stats["queue_depth"] == 0
+    assert stats["total_wait_seconds"] >= 0
+
+@pytest.mark.asyncio
+async def test_password_hash_pool_rejects_when_queue_full():
+    """Callers beyond max_queue are rejected instead of waiting indefinitely."""
+    pool = PasswordHashPool()
+    pool.start(executor_type="thread", max_workers=1, max_queue=0)
+    try:
+        assert (await pool.run(hash_password, "pw", 4)).startswith('$2b$')  # a free worker needs no queue room
+        await pool._slots.acquire()  # occupy the only worker slot
+        with pytest.raises(PasswordHashQueueFull):
+            await pool.run(hash_password, "pw", 4)
+        pool._slots.release()
+    finally:
+        pool.shutdown()
+    assert pool.stats()["rejected"] == 1
+
+def test_password_hash_pool_rejects_unknown_executor():
+    with pytest.raises(ValueError):
+        PasswordHashPool().start(executor_type="gpu")
@@ -0,0 +1,57 @@
+import json
+import uuid
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from app.models.user_model import User, UserRole
+from app.schemas.link_schema import Link
+from app.schemas.pagination_schema import PaginationLink
+from app.schemas.user_schemas import UserListResponse, UserResponse
+from app.utils.serialization import user_list_payload, user_payload
+
+def make_user(**overrides):
+    data = dict(id=uuid.uuid4(), nickname="john_doe", email="john.doe@example.com", first_name="John",
+                last_name="Doe", bio=None, profile_picture_url=None, linkedin_profile_url=None,
+                github_profile_url="https://github.com/johndoe", role=UserRole.ADMIN, is_professional=True)
+    data.update(overrides)
+    return User(**data)
+
+def render(payload):
+    return json.loads(ORJSONResponse(payload).body)
+
+def test_user_payload_matches_user_response():
+    user = make_user()
+    expected = jsonable_encoder(UserResponse.model_validate(user), exclude={"links"})
+    assert render(user_payload(user)) == expected
+
+def test_user_payload_includes_links():
+    user = make_user()
+    link = Link(rel="self", href=f"http://testserver/users/{user.id}", action="view")
+    payload = render(user_payload(user, [link]))
+    assert payload["links"] == [jsonable_encoder(link)]
+    assert payload["role"] == "ADMIN"
+    assert payload["id"] == str(user.id)
+
+def test_user_list_payload_matches_user_list_response():
+    users = [make_user(nickname=f"user_{i}", email=f"user_{i}@example.com") for i in range(3)]
+    links = [PaginationLink(rel="self", href="http://testserver/users/?skip=0&limit=3")]
+    expected = jsonable_encoder(UserListResponse(
+        items=[UserResponse.model_validate(user) for user in users], total=10, page=1, size=3, links=links,
+    ))
+    for item in expected["items"]:
+        del item["links"]
+    assert render(user_list_payload(users, links, total=10, page=1)) == expected
+
+def test_user_list_payload_item_links():
+    users = [make_user()]
+    payload = render(user_list_payload(users, [], item_links=lambda user: [{"rel": "self", "href": f"/users/{user.id}"}]))
+    assert payload["items"][0]["links"] == [{"rel": "self", "href": f"/users/{users[0].id}"}]
+
+async def test_user_payload_of_user_loaded_through_asyncpg(session_factory, verified_user):
+    # A fresh session, so the id comes from asyncpg rather than the fixture's uuid4()
+    async with session_factory() as session:
+        user = (await session.execute(select(User).where(User.id == verified_user.id))).scalar_one()
+        expected = jsonable_encoder(UserResponse.model_validate(user), exclude={"links"})
+        payload = render(user_list_payload([user], []))
+    assert payload["items"][0] == expected
+    assert payload["items"][0]["id"] == str(verified_user.id)
@@ -1,9 +1,15 @@
-from builtins import range
+from builtins import all, len, range, set
+import asyncio
+from uuid import uuid4
 import pytest
-from sqlalchemy import select
-from app.dependencies import get_settings
-from app.models.user_model import User
-from app.services.user_service import UserService
+from sqlalchemy import func, select, text
+from app.database import REPLICA_READ
+from app.dependencies import get_current_user
+from app.models.user_model import User, UserRole
+from app.services.user_service import UserConflictError, UserModifiedError, UserService
+from app.utils.principal_cache import Principal, principal_cache
+from app.utils.security import create_access_token
+from settings.config import settings
 
 pytestmark = pytest.mark.asyncio
 
@@ -27,6 +33,122 @@ async def test_create_user_with_invalid_data(db_session, email_service):
     user = await UserService.create(db_session, user_data, email_service)
     assert user is None
 
+# Test generated nicknames skip taken candidates using one IN query per batch
+async def test_assign_nicknames_skips_taken_candidates(db_session, user, mocker):
+    mocker.patch("app.services.user_service.generate_nicknames", return_value=[user.nickname, "fresh_otter_1", "fresh_otter_2", "fresh_otter_3"])
+    existing = mocker.spy(UserService, "_existing_values")
+    row = {"email": "nick@example.com"}
+    await UserService._assign_nicknames(db_session, [row], set())
+    assert row["nickname"] == "fresh_otter_1"
+    assert existing.call_count == 1
+
+# Test a generated nickname that loses an insert race is replaced and retried
+async def test_create_user_retries_nickname_conflict(db_session, email_service, user, mocker):
+    mocker.patch.object(email_service, "send_verification_email")
+    mocker.patch("app.services.user_service.generate_nicknames", side_effect=[[user.nickname] * 4, ["raced_otter_1"] * 4])
+    created = await UserService.create(db_session, {"email": "raced@example.com", "password": "ValidPassword123!"}, email_service)
+    assert created is not None
+    assert created.nickname == "raced_otter_1"
+
+# Test that creating a user is a single INSERT ... ON CONFLICT statement
+async def test_create_user_issues_one_query(db_session, email_service, mocker, query_log):
+    mocker.patch.object(email_service, "send_verification_email")
+    query_log.clear()
+    created = await UserService.create(db_session, {"email": "one_trip@example.com", "password": "ValidPassword123!"}, email_service)
+    assert created is not None and created.nickname
+    assert len(query_log) == 1
+    assert query_log[0].startswith("INSERT INTO users")
+
+# Test that a taken email or nickname is reported from the unique indexes
+async def test_create_user_conflicts(db_session, email_service, user, mocker):
+    send = mocker.patch.object(email_service, "send_verification_email")
+    # A conflict rolls the session back and expires the fixture, so read it up front
+    email, nickname = user.email, user.nickname
+    with pytest.raises(UserConflictError) as conflict:
+        await UserService.create(db_session, {"email": email, "password": "ValidPassword123!"}, email_service, raise_conflicts=True)
+    assert conflict.value.field == "email"
+    with pytest.raises(UserConflictError) as conflict:
+        await UserService.create(db_session, {"email": "fresh@example.com", "nickname": nickname, "password": "ValidPassword123!"},
+                                 email_service, raise_conflicts=True)
+    assert conflict.value.field == "nickname"
+    assert await UserService.create(db_session, {"email": email, "password": "ValidPassword123!"}, email_service) is None
+    send.assert_not_called()
+
+# Test concurrent registrations of one email create exactly one user
+async def test_create_user_concurrent_duplicates(session_factory, email_service, mocker):
+    mocker.patch.object(email_service, "send_verification_email")
+
+    async def register():
+        async with session_factory() as session:
+            return await UserService.create(session, {"email": "race@example.com", "password": "ValidPassword123!"}, email_service)
+
+    created = await asyncio.gather(*(register() for _ in range(5)))
+    assert len([user for user in created if user is not None]) == 1
+
+# Test bulk creation reports each row and inserts the valid ones
+async def test_bulk_create_users(db_session, email_service, user, mocker):
+    send = mocker.patch.object(email_service, "send_verification_email")
+    rows = [
+        (1, {"email": "bulk_one@example.com", "password": "ValidPassword123!"}),
+        (2, {"email": "bulk_two@example.com", "password": "ValidPassword123!", "nickname": "bulk_two"}),
+        (3, {"email": "not-an-email", "password": "ValidPassword123!"}),
+        (4, {"email": user.email, "password": "ValidPassword123!"}),
+        (5, {"email": "bulk_one@example.com", "password": "ValidPassword123!"}),
+    ]
+    results = await UserService.bulk_create(db_session, rows, email_service)
+    assert [result["status"] for result in results] == ["created", "created", "invalid", "duplicate", "duplicate"]
+    assert send.call_count == 2
+    created = await UserService.get_by_email(db_session, "bulk_one@example.com")
+    assert created is not None
+    assert created.nickname
+    assert created.id == results[0]["id"]
+
+# Test batches over the bind parameter limit are split across several INSERTs
+async def test_bulk_create_splits_insert_by_bind_limit(db_session, email_service, mocker):
+    mocker.patch.object(email_service, "send_verification_email")
+    mocker.patch("app.services.user_service.MAX_BIND_PARAMETERS", 2 * len(User.__table__.columns))
+    execute = mocker.spy(db_session, "execute")
+    rows = [(i, {"email": f"bulk_split_{i}@example.com", "password": "ValidPassword123!", "nickname": f"bulk_split_{i}"}) for i in range(5)]
+    results = await UserService.bulk_create(db_session, rows, email_service)
+    assert [result["status"] for result in results] == ["created"] * 5
+    inserts = [call for call in execute.call_args_list if call.args[0].is_insert]
+    assert len(inserts) == 3
+
+# Test listing with filters and an indexed sort
+async def test_list_users_filtered_and_sorted(db_session, users_with_same_role_50_users, admin_user, locked_user):
+    users = await UserService.list_users(db_session, 0, 100, "-nickname", role=UserRole.AUTHENTICATED, is_locked=False)
+    assert len(users) == 50
+    assert [user.nickname for user in users] == sorted((user.nickname for user in users), reverse=True)
+    locked = await UserService.list_users(db_session, 0, 100, is_locked=True)
+    assert [user.id for user in locked] == [locked_user.id]
+    assert await UserService.count(db_session, role=UserRole.ADMIN) == 1
+
+async def test_list_users_rejects_unindexed_sort(db_session):
+    with pytest.raises(ValueError):
+        await UserService.list_users(db_session, 0, 10, "bio")
+
+# Test search ranks an exact nickname match first and pages with a cursor
+async def test_search_users(db_session, users_with_same_role_50_users):
+    target = users_with_same_role_50_users[0]
+    users, next_cursor = await UserService.search(db_session, target.nickname, limit=1)
+    assert users[0].id == target.id
+    if next_cursor:
+        more, _ = await UserService.search(db_session, target.nickname, limit=1, cursor=next_cursor)
+        assert target.id not in {user.id for user in more}
+
+async def test_search_users_blank_query(db_session):
+    assert await UserService.search(db_session, "   ") == ([], None)
+
+# Test streaming selected columns with a filter
+async def test_stream_users(db_session, users_with_same_role_50_users, admin_user):
+    rows = [row async for row in UserService.stream_users(db_session, ["email", "role"], role=UserRole.AUTHENTICATED)]
+    assert len(rows) == 50
+    assert admin_user.email not in {row[0] for row in rows}
+
+async def test_stream_users_rejects_unknown_fields(db_session):
+    with pytest.raises(ValueError):
+        [row async for row in UserService.stream_users(db_session, ["hashed_password"])]
+
 # Test fetching a user by ID when the user exists
 async def test_get_by_id_user_exists(db_session, user):
     retrieved_user = await UserService.get_by_id(db_session, user.id)
@@ -70,6 +192,94 @@ async def test_update_user_invalid_data(db_session, user):
     updated_user = await UserService.update(db_session, user.id, {"email": "invalidemail"})
     assert updated_user is None
 
+# Test that an update is a single UPDATE ... RETURNING statement
+async def test_update_user_issues_one_query(db_session, user, query_log):
+    query_log.clear()
+    updated_user = await UserService.update(db_session, user.id, {"bio": "One round trip"})
+    assert updated_user.bio == "One round trip"
+    assert len(query_log) == 1
+    assert query_log[0].startswith("UPDATE users")
+
+# Test that updating to another user's nickname or email raises a conflict from the unique index
+async def test_update_user_conflict(db_session, user, verified_user, query_log):
+    # The conflict rolls the session back and expires the fixtures, so read them up front
+    user_id, taken_nickname, taken_email = user.id, verified_user.nickname, verified_user.email
+    query_log.clear()
+    with pytest.raises(UserConflictError) as conflict:
+        await UserService.update(db_session, user_id, {"nickname": taken_nickname})
+    assert conflict.value.field == "nickname"
+    assert len(query_log) == 1
+    with pytest.raises(UserConflictError) as conflict:
+        await UserService.update(db_session, user_id, {"email": taken_email})
+    assert conflict.value.field == "email"
+
+# Test that an If-Match version is checked by the UPDATE itself, so only one of two concurrent writers wins
+async def test_update_user_with_expected_version(session_factory, user):
+    version = [user.updated_at]
+    user_id = user.id
+
+    async def write(bio):
+        async with session_factory() as session:
+            try:
+                return await UserService.update(session, user_id, {"bio": bio}, expected_updated_at=version)
+            except UserModifiedError:
+                return None
+
+    results = await asyncio.gather(write("first"), write("second"))
+    assert len([result for result in results if result is not None]) == 1
+    async with session_factory() as session:
+        with pytest.raises(UserModifiedError):
+            await UserService.update(session, user_id, {"bio": "stale"}, expected_updated_at=version)
+        assert await UserService.update(session, uuid4(), {"bio": "Nobody"}, expected_updated_at=version) is None
+
+# Test that updating a missing user returns None
+async def test_update_user_does_not_exist(db_session):
+    assert await UserService.update(db_session, uuid4(), {"bio": "Nobody"}) is None
+
+# Test the number of queries issued by single-user lookups and changes
+@pytest.mark.parametrize("call", [
+    lambda session, user: UserService.get_by_id(session, user.id),
+    lambda session, user: UserService.get_by_email(session, user.email),
+    lambda session, user: UserService.unlock_user_account(session, user.id),
+    lambda session, user: UserService.verify_email_with_token(session, user.id, "token"),
+    lambda session, user: UserService.delete(session, user.id),
+])
+async def test_single_user_methods_issue_one_query(db_session, locked_user, query_log, call):
+    query_log.clear()
+    await call(db_session, locked_user)
+    assert len(query_log) == 1
+
+# Test that reads run without a COMMIT
+async def test_reads_do_not_commit(db_session, user, mocker):
+    commit = mocker.spy(db_session, "commit")
+    assert await UserService.get_by_id(db_session, user.id) is not None
+    assert await UserService.get_by_email(db_session, user.email) is not None
+    assert len(await UserService.list_users(db_session, 0, 10)) == 1
+    assert await UserService.count(db_session, strategy="exact") == 1
+    commit.assert_not_called()
+
+# Test that get_by_id reads the primary unless the caller opts into the replica
+async def test_get_by_id_reads_primary_by_default(db_session, user, mocker):
+    execute = mocker.spy(db_session, "execute")
+    await UserService.get_by_id(db_session, user.id)
+    assert execute.call_args.kwargs["bind_arguments"] is None
+    await UserService.get_by_id(db_session, user.id, replica=True)
+    assert execute.call_args.kwargs["bind_arguments"] == REPLICA_READ
+
+# Test that the auth lookup which refills the principal cache reads the primary
+async def test_get_current_user_reads_primary(db_session, verified_user, mocker):
+    principal_cache.invalidate(verified_user.id)
+    execute = mocker.spy(db_session, "execute")
+    principal = await get_current_user(db_session, create_access_token(verified_user.id))
+    assert str(principal.id) == str(verified_user.id)
+    assert execute.call_args.kwargs["bind_arguments"] is None
+
+# Test that updating a user drops its cached principal
+async def test_update_user_invalidates_principal_cache(db_session, user):
+    principal_cache.set(Principal.from_user(user))
+    await UserService.update(db_session, user.id, {"first_name": "Changed"})
+    assert principal_cache.get(user.id) is None
+
 # Test deleting a user who exists
 async def test_delete_user_exists(db_session, user):
     deletion_success = await UserService.delete(db_session, user.id)
@@ -89,6 +299,53 @@ async def test_list_users_with_pagination(db_session, users_with_same_role_50_us
     assert len(users_page_2) == 10
     assert users_page_1[0].id != users_page_2[0].id
 
+# Test walking every page with keyset pagination, forwards and backwards
+async def test_list_users_keyset_pagination(db_session, users_with_same_role_50_users):
+    seen = []
+    page, next_cursor, prev_cursor = await UserService.list_users_keyset(db_session, limit=20)
+    assert prev_cursor is None
+    seen.extend(user.id for user in page)
+    while next_cursor:
+        page, next_cursor, prev_cursor = await UserService.list_users_keyset(db_session, limit=20, cursor=next_cursor)
+        seen.extend(user.id for user in page)
+    assert len(seen) == 50
+    assert len(set(seen)) == 50
+
+    offset_ids = [user.id for user in await UserService.list_users(db_session, skip=0, limit=50)]
+    assert seen == offset_ids
+
+    # Last page holds 10 users; its prev cursor returns the 20 users before it
+    previous_page, _, _ = await UserService.list_users_keyset(db_session, limit=20, cursor=prev_cursor)
+    assert [user.id for user in previous_page] == offset_ids[20:40]
+
+async def test_list_users_keyset_invalid_cursor(db_session):
+    with pytest.raises(ValueError):
+        await UserService.list_users_keyset(db_session, limit=10, cursor="not-a-cursor")
+
+# Test every count strategy agrees on a freshly created table
+@pytest.mark.parametrize("strategy", ["exact", "estimated", "counter"])
+async def test_count_strategies(db_session, users_with_same_role_50_users, strategy):
+    # The test schema is built with create_all, so 'estimated' (never analyzed) and
+    # 'counter' (no counter table) both fall back to an exact count here.
+    assert await UserService.count(db_session, strategy=strategy) == 50
+
+# Test the counter strategy reads table_row_counts once it is known to exist
+async def test_count_counter_table(db_session, monkeypatch):
+    monkeypatch.setattr(UserService, "_row_counter_migrated", None)
+    await db_session.execute(text("CREATE TABLE table_row_counts (table_name text PRIMARY KEY, row_count bigint NOT NULL)"))
+    await db_session.execute(text("INSERT INTO table_row_counts VALUES ('users', 7)"))
+    await db_session.commit()
+    try:
+        assert await UserService.count(db_session, strategy="counter") == 7
+        assert UserService._row_counter_migrated is True
+    finally:
+        await db_session.execute(text("DROP TABLE table_row_counts"))
+        await db_session.commit()
+
+async def test_count_unknown_strategy(db_session):
+    with pytest.raises(ValueError):
+        await UserService.count(db_session, strategy="guess")
+
 # Test registering a user with valid data
 async def test_register_user_with_valid_data(db_session, email_service):
     user_data = {
@@ -129,13 +386,43 @@ async def test_login_user_incorrect_password(db_session, user):
 
 # Test account lock after maximum failed login attempts
 async def test_account_lock_after_failed_logins(db_session, verified_user):
-    max_login_attempts = get_settings().max_login_attempts
-    for _ in range(max_login_attempts):
+    for _ in range(settings.max_login_attempts):
         await UserService.login_user(db_session, verified_user.email, "wrongpassword")
     
     is_locked = await UserService.is_account_locked(db_session, verified_user.email)
     assert is_locked, "The account should be locked after the maximum number of failed login attempts."
 
+# Test that the attempt which locks the account reports it as locked
+async def test_authenticate_reports_lock_on_final_attempt(db_session, verified_user):
+    email = verified_user.email
+    for _ in range(settings.max_login_attempts - 1):
+        assert await UserService.authenticate(db_session, email, "wrongpassword") == (None, False)
+    assert await UserService.authenticate(db_session, email, "wrongpassword") == (None, True)
+    assert verified_user.is_locked is True
+
+# Test that locked and unverified accounts are rejected without running bcrypt
+async def test_authenticate_locked_user_skips_bcrypt(db_session, locked_user, mocker):
+    verify = mocker.patch("app.services.user_service.verify_password_async")
+    user, locked = await UserService.authenticate(db_session, locked_user.email, "MySuperPassword$1234")
+    assert user is None
+    assert locked is True
+    verify.assert_not_called()
+
+async def test_authenticate_unverified_user_skips_bcrypt(db_session, unverified_user, mocker):
+    verify = mocker.patch("app.services.user_service.verify_password_async")
+    user, locked = await UserService.authenticate(db_session, unverified_user.email, "MySuperPassword$1234")
+    assert user is None
+    assert locked is False
+    verify.assert_not_called()
+
+# Test that a successful login resets the failed attempt counter
+async def test_authenticate_resets_failed_attempts(db_session, verified_user):
+    await UserService.authenticate(db_session, verified_user.email, "wrongpassword")
+    user, locked = await UserService.authenticate(db_session, verified_user.email, "MySuperPassword$1234")
+    assert locked is False
+    assert user.failed_login_attempts == 0
+    assert user.last_login_at is not None
+
 # Test resetting a user's password
 async def test_reset_password(db_session, user):
     new_password = "NewPassword123!"
@@ -154,5 +441,55 @@ async def test_verify_email_with_token(db_session, user):
 async def test_unlock_user_account(db_session, locked_user):
     unlocked = await UserService.unlock_user_account(db_session, locked_user.id)
     assert unlocked, "The account should be unlocked"
+    assert principal_cache.get(locked_user.id) is None
     refreshed_user = await UserService.get_by_id(db_session, locked_user.id)
     assert not refreshed_user.is_locked, "The user should no longer be locked"
+
+# Test loading several users in one query
+async def test_get_many_by_ids(db_session, users_with_same_role_50_users):
+    wanted = [user.id for user in users_with_same_role_50_users[:5]]
+    found = await UserService.get_many_by_ids(db_session, wanted + [uuid4()])
+    assert set(found) == set(wanted)
+
+# Test bulk role changes report per-id outcomes in request order
+async def test_bulk_set_role(db_session, users_with_same_role_50_users):
+    ids = [user.id for user in users_with_same_role_50_users]
+    missing = uuid4()
+    results = await UserService.bulk_set_role(db_session, ids + [missing, ids[0]], UserRole.MANAGER)
+    assert [result["id"] for result in results] == ids + [missing]
+    assert [result["status"] for result in results] == ["updated"] * len(ids) + ["not_found"]
+    roles = await db_session.execute(select(User.role).where(User.id.in_(ids)).execution_options(populate_existing=True))
+    assert set(roles.scalars()) == {UserRole.MANAGER}
+
+# Test bulk lock and unlock
+async def test_bulk_lock_and_unlock(db_session, users_with_same_role_50_users, locked_user):
+    ids = [user.id for user in users_with_same_role_50_users[:10]]
+    await UserService.bulk_lock(db_session, ids)
+    locked = await db_session.execute(select(func.count()).select_from(User).where(User.id.in_(ids), User.is_locked))
+    assert locked.scalar() == 10
+    results = await UserService.bulk_unlock(db_session, ids + [locked_user.id])
+    assert {result["status"] for result in results} == {"updated"}
+    user = (await UserService.get_many_by_ids(db_session, [locked_user.id]))[locked_user.id]
+    await db_session.refresh(user)
+    assert not user.is_locked and user.failed_login_attempts == 0
+
+# Test bulk verification only promotes ANONYMOUS users
+async def test_bulk_verify_email(db_session, unverified_user, admin_user):
+    admin_user.email_verified = False
+    await db_session.commit()
+    results = await UserService.bulk_verify_email(db_session, [unverified_user.id, admin_user.id])
+    assert [result["status"] for result in results] == ["updated", "updated"]
+    await db_session.refresh(unverified_user)
+    await db_session.refresh(admin_user)
+    assert unverified_user.email_verified and admin_user.email_verified
+    assert unverified_user.verification_token is None
+    assert admin_user.role == UserRole.ADMIN
+
+# Test bulk deletion
+async def test_bulk_delete(db_session, users_with_same_role_50_users):
+    ids = [user.id for user in users_with_same_role_50_users[:20]]
+    missing = uuid4()
+    results = await UserService.bulk_delete(db_session, [missing] + ids)
+    assert results[0] == {"id": missing, "status": "not_found"}
+    assert all(result["status"] == "deleted" for result in results[1:])
+    assert await UserService.count(db_session, strategy="exact") == 30
@@ -0,0 +1,74 @@
+from builtins import Exception, len, range
+import asyncio
+import socket
+import pytest
+from app.utils.smtp_connection import SMTPClient
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 OK"
+
+@pytest.fixture
+def smtp_server():
+    """A local aiosmtpd server standing in for the real SMTP relay."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+def make_client(controller, pool_size=2):
+    return SMTPClient(controller.hostname, controller.port, "sender@example.com", "", pool_size=pool_size, start_tls=False)
+
+@pytest.mark.asyncio
+async def test_connections_are_reused_across_messages(smtp_server):
+    controller, handler = smtp_server
+    client = make_client(controller, pool_size=2)
+    await asyncio.gather(*(client.send_email("Hello", f"<p>{i}</p>", f"user{i}@example.com") for i in range(20)))
+    await client.close()
+    assert len(handler.messages) == 20
+    assert {message.rcpt_tos[0] for message in handler.messages} == {f"user{i}@example.com" for i in range(20)}
+    assert client.stats() == {"idle_connections": 0, "connects": 2, "reconnects": 0}
+
+@pytest.mark.asyncio
+async def test_dropped_pooled_connection_is_reconnected(smtp_server):
+    controller, handler = smtp_server
+    client = make_client(controller, pool_size=1)
+    await client.send_email("Hello", "<p>1</p>", "first@example.com")
+    # Simulate the server closing an idle connection without the client noticing
+    pooled, _ = client._idle[0]
+    pooled.transport.close()
+    await client.send_email("Hello", "<p>2</p>", "second@example.com")
+    await client.close()
+    assert [message.rcpt_tos[0] for message in handler.messages] == ["first@example.com", "second@example.com"]
+    assert client.connects == 2
+
+@pytest.mark.asyncio
+async def test_idle_connections_past_idle_timeout_are_replaced(smtp_server):
+    controller, handler = smtp_server
+    client = make_client(controller, pool_size=1)
+    client.idle_timeout = 0
+    await client.send_email("Hello", "<p>1</p>", "first@example.com")
+    await client.send_email("Hello", "<p>2</p>", "second@example.com")
+    await client.close()
+    assert len(handler.messages) == 2
+    assert client.connects == 2 and client.reconnects == 0
+
+@pytest.mark.asyncio
+async def test_send_fails_when_server_is_unreachable():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    client = SMTPClient("127.0.0.1", port, "sender@example.com", "", start_tls=False, timeout=2)
+    with pytest.raises(Exception):
+        await client.send_email("Hello", "<p>1</p>", "user@example.com")
+    assert client.stats()["idle_connections"] == 0
@@ -0,0 +1,42 @@
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+import pytest
+from app.models.user_model import UserRole
+from app.utils.stream_export import export_value, iter_csv, iter_ndjson
+
+async def as_rows(*rows):
+    for row in rows:
+        yield row
+
+async def collect(chunks):
+    return b"".join([chunk async for chunk in chunks]).decode("utf-8")
+
+def test_export_value_converts_scalars():
+    user_id = uuid4()
+    created_at = datetime(2024, 4, 20, 21, 20, tzinfo=timezone.utc)
+    assert export_value(user_id) == str(user_id)
+    assert export_value(created_at) == "2024-04-20T21:20:00+00:00"
+    assert export_value(UserRole.ADMIN) == "ADMIN"
+    assert export_value(None) is None
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_batches_rows():
+    chunks = [chunk async for chunk in iter_ndjson(as_rows(("a@example.com", True), ("b@example.com", False), ("c@example.com", None)), ["email", "is_locked"], batch_size=2)]
+    assert len(chunks) == 2
+    lines = b"".join(chunks).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"email": "a@example.com", "is_locked": True},
+        {"email": "b@example.com", "is_locked": False},
+        {"email": "c@example.com", "is_locked": None},
+    ]
+
+@pytest.mark.asyncio
+async def test_iter_csv_writes_header_and_rows():
+    body = await collect(iter_csv(as_rows(("a@example.com", UserRole.MANAGER),), ["email", "role"]))
+    assert body.splitlines() == ["email,role", "a@example.com,MANAGER"]
+
+@pytest.mark.asyncio
+async def test_iter_csv_with_no_rows_still_has_header():
+    body = await collect(iter_csv(as_rows(), ["email"]))
+    assert body.splitlines() == ["email"]
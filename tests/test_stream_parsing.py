@@ -0,0 +1,36 @@
+import pytest
+from app.utils.stream_parsing import iter_csv_rows, iter_lines, iter_ndjson_rows
+
+async def chunked(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+async def collect(rows):
+    return [row async for row in rows]
+
+@pytest.mark.asyncio
+async def test_iter_lines_handles_split_chunks_and_utf8():
+    snowman = "☃".encode("utf-8")
+    lines = await collect(iter_lines(chunked(b"first\r\nsec", b"ond " + snowman[:1], snowman[1:] + b"\nlast")))
+    assert lines == ["first", "second ☃", "last"]
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_rows():
+    rows = await collect(iter_ndjson_rows(chunked(b'{"email": "a@example.com"}\n\n', b'not json\n[1, 2]\n')))
+    assert rows[0] == (1, {"email": "a@example.com"}, None)
+    assert rows[1][0] == 2 and rows[1][1] is None and rows[1][2].startswith("Invalid JSON")
+    assert rows[2] == (3, None, "Row must be a JSON object")
+
+@pytest.mark.asyncio
+async def test_iter_csv_rows_with_quoted_newlines():
+    body = b'email,bio\na@example.com,"two\nlines, ""quoted"""\nb@example.com,\n'
+    rows = await collect(iter_csv_rows(chunked(body[:20], body[20:])))
+    assert rows == [
+        (1, {"email": "a@example.com", "bio": 'two\nlines, "quoted"'}, None),
+        (2, {"email": "b@example.com", "bio": None}, None),
+    ]
+
+@pytest.mark.asyncio
+async def test_iter_csv_rows_reports_bad_rows():
+    rows = await collect(iter_csv_rows(chunked(b'email,bio\na@example.com\n"open')))
+    assert rows == [(1, None, "Expected 2 columns, got 1"), (2, None, "Unterminated quoted field")]
@@ -0,0 +1,45 @@
+import os
+import pytest
+from app.utils.template_manager import TemplateManager
+
+@pytest.fixture
+def template_manager(tmp_path):
+    (tmp_path / 'header.md').write_text("# Header\n", encoding='utf-8')
+    (tmp_path / 'footer.md').write_text("Footer\n", encoding='utf-8')
+    (tmp_path / 'greeting.md').write_text("Hello {name},\n\n[Open]({url})\n", encoding='utf-8')
+    manager = TemplateManager()
+    manager.templates_dir = tmp_path
+    return manager
+
+def test_render_template_substitutes_and_styles(template_manager):
+    html = template_manager.render_template('greeting', name="Ada", url="http://example.com/a")
+    assert "Hello Ada," in html
+    assert 'href="http://example.com/a"' in html
+    assert '<h1 style="' in html
+    assert '<p style="' in html
+    assert html.startswith('<div style="')
+
+def test_render_template_escapes_values(template_manager):
+    html = template_manager.render_template('greeting', name="<script>", url="http://example.com/?a=1&b=2")
+    assert "<script>" not in html
+    assert "&lt;script&gt;" in html
+    assert 'href="http://example.com/?a=1&amp;b=2"' in html
+
+def test_render_template_reuses_compiled_template(template_manager, mocker):
+    template_manager.render_template('greeting', name="Ada", url="http://example.com")
+    read = mocker.spy(template_manager, '_read_template')
+    template_manager.render_template('greeting', name="Grace", url="http://example.com")
+    assert read.call_count == 0
+
+def test_render_template_recompiles_when_file_changes(template_manager, tmp_path):
+    template_manager.render_template('greeting', name="Ada", url="http://example.com")
+    path = tmp_path / 'greeting.md'
+    path.write_text("Goodbye {name}\n", encoding='utf-8')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    html = template_manager.render_template('greeting', name="Ada")
+    assert "Goodbye Ada" in html
+
+def test_render_template_missing_value(template_manager):
+    with pytest.raises(KeyError):
+        template_manager.render_template('greeting', name="Ada")